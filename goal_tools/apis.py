@@ -10,15 +10,112 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import codecs
 import json
 import logging
-
-import requests
+import threading
 
 LOG = logging.getLogger(__name__)
 
+# Response codes that indicate the server wants us to try again later.
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# Default settings for the shared session.
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+
+# How many bytes to read at a time when streaming a response.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Gerrit's REST API prepends a JSON-breaker to avoid XSS vulnerabilities
+XSSI_PREFIX = ")]}'"
+
+# Characters that can continue a JSON number, plus the empty string
+# for the end of the buffer.
+_NUMBER_CONTINUES = set('0123456789.eE+-') | {''}
+
+_session = None
+_session_lock = threading.Lock()
+_session_settings = {
+    'pool_connections': POOL_CONNECTIONS,
+    'pool_maxsize': POOL_MAXSIZE,
+    'retries': RETRIES,
+    'backoff_factor': BACKOFF_FACTOR,
+}
+
+
+def _build_session(pool_connections, pool_maxsize, retries, backoff_factor):
+    # requests is slow to import, so wait until a command needs it.
+    import requests
+    from urllib3.util import retry
+
+    policy = retry.Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=policy,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def configure_session(pool_connections=POOL_CONNECTIONS,
+                      pool_maxsize=POOL_MAXSIZE,
+                      retries=RETRIES,
+                      backoff_factor=BACKOFF_FACTOR):
+    """Set up the HTTP session shared by all API queries
+
+    Connections are kept alive and reused for every request made
+    through requester(). Failed connections and responses with one
+    of the status codes in RETRY_STATUS are retried with exponential
+    backoff, honoring any Retry-After header sent by the server.
+
+    The session is built with these settings the next time one is
+    needed, replacing any existing session.
+
+    :param pool_connections: The number of hosts to keep pools for.
+    :type pool_connections: int
+    :param pool_maxsize: The number of connections to keep per host.
+    :type pool_maxsize: int
+    :param retries: The number of times to retry a request.
+    :type retries: int
+    :param backoff_factor: Seconds to scale the exponential delay by.
+    :type backoff_factor: float
+
+    """
+    global _session
+    with _session_lock:
+        _session_settings.update(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            retries=retries,
+            backoff_factor=backoff_factor,
+        )
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
 
-def requester(url, params={}, headers={}):
+def get_session():
+    "Return the shared HTTP session, creating it if needed."
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session(**_session_settings)
+        return _session
+
+
+def requester(url, params={}, headers={}, stream=False):
     """A requests wrapper to consistently retry HTTPS queries
 
     :param url: The URL to get.
@@ -27,12 +124,12 @@ def requester(url, params={}, headers={}):
     :type params: dict(str, str)
     :param headers: Additional headers to set.
     :type params: dict(str, str)
+    :param stream: Leave the body to be read incrementally.
+    :type stream: bool
 
     """
-    # Try up to 3 times
-    retry = requests.Session()
-    retry.mount("https://", requests.adapters.HTTPAdapter(max_retries=3))
-    return retry.get(url=url, params=params, headers=headers)
+    return get_session().get(
+        url=url, params=params, headers=headers, stream=stream)
 
 
 def decode_json(raw):
@@ -46,9 +143,8 @@ def decode_json(raw):
 
     """
 
-    # Gerrit's REST API prepends a JSON-breaker to avoid XSS vulnerabilities
-    if raw.text.startswith(")]}'"):
-        trimmed = raw.text[4:]
+    if raw.text.startswith(XSSI_PREFIX):
+        trimmed = raw.text[len(XSSI_PREFIX):]
     else:
         trimmed = raw.text
 
@@ -62,3 +158,91 @@ def decode_json(raw):
             raw, raw.url, trimmed)
         raise
     return decoded
+
+
+def iter_json_array(raw, chunk_size=STREAM_CHUNK_SIZE):
+    """Generator for the items of a JSON array in a streamed response
+
+    The body is read and decoded incrementally, so only about one
+    item is held in memory at a time instead of the whole response.
+    The ')]}' XSS prefix is skipped if it is present.
+
+    :param raw: Response from requester() with stream=True
+    :type raw: requests.Response
+    :param chunk_size: The number of bytes to read at once.
+    :type chunk_size: int
+
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(raw.encoding or 'utf-8')()
+    chunks = raw.iter_content(chunk_size=chunk_size)
+    buf = ''
+    pos = 0
+
+    def more():
+        "Add the next chunk to the buffer, returning False at the end."
+        nonlocal buf, pos
+        for chunk in chunks:
+            decoded = text.decode(chunk)
+            if decoded:
+                # Drop the part of the buffer we are finished with.
+                buf = buf[pos:] + decoded
+                pos = 0
+                return True
+        return False
+
+    def fail(msg):
+        LOG.error(
+            '\nrequest returned %s error to query:\n\n    %s\n'
+            '\nwith detail:\n\n    %s\n',
+            raw, raw.url, buf[pos:pos + 1000])
+        raise ValueError(msg)
+
+    def skip_space():
+        "Move past whitespace, returning False at the end."
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf):
+                return True
+            if not more():
+                return False
+
+    while len(buf) - pos < len(XSSI_PREFIX) and more():
+        pass
+    if buf.startswith(XSSI_PREFIX, pos):
+        pos += len(XSSI_PREFIX)
+
+    if not skip_space() or buf[pos] != '[':
+        fail('expected a JSON array')
+    pos += 1
+
+    while True:
+        if not skip_space():
+            fail('unexpected end of JSON array')
+        if buf[pos] == ']':
+            return
+        if buf[pos] == ',':
+            pos += 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Assume the item is incomplete and try again with more
+            # data. Read at least twice what we have so large items
+            # are not parsed over and over.
+            want = 2 * (len(buf) - pos)
+            if not more():
+                fail('could not decode JSON array item')
+            while len(buf) - pos < want and more():
+                pass
+            continue
+        if (isinstance(item, (int, float)) and
+                buf[end:end + 1] in _NUMBER_CONTINUES and more()):
+            # The decoder stops a number at the end of the buffer, or
+            # before a fraction or exponent that has not all arrived,
+            # so parse it again with the next chunk.
+            continue
+        pos = end
+        yield item
@@ -0,0 +1,85 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Credit contributions to organizations.
+"""
+
+import itertools
+import logging
+
+LOG = logging.getLogger(__name__)
+
+# The number of participants to attribute together.
+CHUNK_SIZE = 500
+
+# The organization used when no other can be found.
+UNKNOWN = '*unknown'
+
+
+def find_organization(participant, member, canonical_orgs):
+    """Return the organization to credit for a participant's work.
+
+    The organization comes from the member's affiliation at the time
+    of the work if the participant is a Foundation member, or from
+    their email domain otherwise.
+
+    :param participant: The person and their contribution.
+    :type participant: goal_tools.gerrit.Participant
+    :param member: The Foundation member, or None.
+    :type member: goal_tools.foundation.Member
+    :param canonical_orgs: Organization names and domains.
+    :type canonical_orgs: goal_tools.organizations.Organizations
+
+    """
+    organization = None
+    if member:
+        affiliation = member.find_affiliation(participant.date)
+        if affiliation and affiliation.organization:
+            organization = canonical_orgs[affiliation.organization]
+    else:
+        organization = canonical_orgs.from_email(participant.email)
+    return organization or UNKNOWN
+
+
+def attribute(items, member_factory, canonical_orgs, chunk_size=CHUNK_SIZE):
+    """Find the organization for each of a stream of participants.
+
+    The input is consumed chunk_size items at a time and the members
+    for each chunk are looked up together. Yields lists of
+    (review, participant, organization) tuples, in the order of the
+    input.
+
+    :param items: (review, participant) pairs
+    :type items: iterable(tuple)
+    :param member_factory: Source of Foundation member data.
+    :type member_factory: goal_tools.foundation.MemberFactory
+    :param canonical_orgs: Organization names and domains.
+    :type canonical_orgs: goal_tools.organizations.Organizations
+    :param chunk_size: The number of participants per chunk.
+    :type chunk_size: int
+
+    """
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, chunk_size))
+        if not chunk:
+            break
+        members = member_factory.fetch_many(
+            participant.email for review, participant in chunk
+        )
+        LOG.debug('attributing %d participants', len(chunk))
+        yield [
+            (review, participant,
+             find_organization(participant, members[participant.email],
+                               canonical_orgs))
+            for review, participant in chunk
+        ]
@@ -11,49 +11,367 @@
 # under the License.
 
 import collections
+import dbm
+import functools
 import logging
+import os
+import pickle
 import shelve
+import sqlite3
+import tempfile
+import weakref
 
 LOG = logging.getLogger(__name__)
 
+# Where data derived from downloads and packaged files is saved
+# between runs. Set by user_cache_dir() when it is first needed, so
+# commands that do not save anything do not import appdirs.
+USER_CACHE_DIR = None
+
+# Pass as a cache_dir argument to save files in user_cache_dir(),
+# looked up when the files are used rather than when the function is
+# defined.
+USER_CACHE = object()
+
+# Key namespaces that get their own table. Anything else goes into
+# the generic table, keyed by the full joined key.
+_NAMESPACES = ('review', 'member', 'email')
+_MISC_TABLE = 'misc'
+
+SQL_CREATE = """
+create table if not exists {table} (
+  id text primary key,
+  value blob
+)
+"""
+
+
+def _flush(conn, pending):
+    "Write the pending values to the database in one transaction."
+    if not pending:
+        return
+    LOG.debug('writing %d items to cache', len(pending))
+    by_table = {}
+    for (table, id_), value in pending.items():
+        by_table.setdefault(table, []).append((id_, value))
+    with conn:
+        for table, rows in by_table.items():
+            conn.executemany(
+                'insert or replace into {} (id, value) '
+                'values (?, ?)'.format(table),
+                rows,
+            )
+    pending.clear()
+
+
+class MemoryTier:
+    """Bounded in-memory LRU store for cached values
+
+    The tier can be limited by the number of entries, the total size
+    of the pickled values, or both. A limit of None means that
+    dimension is unbounded. The least recently used items are evicted
+    first.
+
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._data = collections.OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key):
+        "Return the value for the key and mark it as recently used."
+        try:
+            value, size = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, size):
+        "Store the value, evicting older items if needed to make room."
+        self.discard(key)
+        self._data[key] = (value, size)
+        self._bytes += size
+        self._evict()
+
+    def discard(self, key):
+        if key in self._data:
+            self._bytes -= self._data.pop(key)[1]
+
+    def _over_limit(self):
+        if self._max_entries is not None:
+            if len(self._data) > self._max_entries:
+                return True
+        if self._max_bytes is not None:
+            if self._bytes > self._max_bytes:
+                return True
+        return False
+
+    def _evict(self):
+        while self._data and self._over_limit():
+            key, (value, size) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._data),
+            'bytes': self._bytes,
+        }
+
+
+def user_cache_dir():
+    "Return the directory for data saved between runs."
+    global USER_CACHE_DIR
+    if USER_CACHE_DIR is None:
+        import appdirs
+        USER_CACHE_DIR = appdirs.user_cache_dir('OSGoalTools', 'OpenStack')
+    return USER_CACHE_DIR
+
+
+def find_cache_dir(cache_dir):
+    "Return the directory a cache_dir argument refers to, or None."
+    if cache_dir is USER_CACHE:
+        return user_cache_dir()
+    return cache_dir
+
+
+def read_pickle(filename):
+    """Return the data saved in the file, or None.
+
+    A missing or unreadable file is treated as empty.
+
+    """
+    try:
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        LOG.debug('could not read %s: %s', filename, err)
+    return None
+
+
+def write_pickle(filename, data):
+    """Save the data in the file, replacing it atomically.
+
+    Failures are logged and otherwise ignored, since the file is only
+    a cache.
+
+    """
+    dirname = os.path.dirname(filename)
+    try:
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=dirname)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpname, filename)
+    except OSError as err:
+        LOG.warning('could not save %s: %s', filename, err)
+
+
+_MEMO_PREFIX = '_memo_'
+
+
+def memoize(maxsize=None):
+    """Decorator to remember the results of a method on each instance.
+
+    The results are kept in a MemoryTier stored on the instance, so
+    each object gets its own table and the table goes away with the
+    object. Use a maxsize of None for arguments drawn from a small,
+    fixed set of values and a limit for open-ended ones. The
+    positional arguments are the key.
+
+    """
+    def decorator(func):
+        attr = _MEMO_PREFIX + func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            try:
+                table = self.__dict__[attr]
+            except KeyError:
+                table = self.__dict__[attr] = MemoryTier(maxsize)
+            try:
+                return table.get(args)
+            except KeyError:
+                pass
+            value = func(self, *args)
+            table.put(args, value, 0)
+            return value
+
+        return wrapper
+    return decorator
+
+
+def memo_stats(obj):
+    "Return the memo table stats for the object, by method name."
+    return {
+        name[len(_MEMO_PREFIX):]: table.stats
+        for name, table in vars(obj).items()
+        if name.startswith(_MEMO_PREFIX)
+    }
+
+
+def _close(conn, pending, legacy):
+    _flush(conn, pending)
+    conn.close()
+    if legacy is not None:
+        legacy.close()
+
 
 class Cache:
     """Data cache with transparent key management
 
     Keys passed to methods are expected to be tuples of strings but
     are converted to something the underlying implementation can
-    store and retrieve.
+    store and retrieve. The first part of the key is treated as a
+    namespace, and the well-known namespaces are stored in separate
+    tables in an SQLite database.
 
     Values stored in the cache are pickled before being written and
-    unpickled before being returned.
+    unpickled before being returned. Writes are buffered and saved
+    in batches of ``batch_size`` items.
 
-    """
+    Recently used values are kept in memory, up to ``max_entries``
+    items or ``max_bytes`` bytes of pickled data.
 
-    def __init__(self, filename, preload=True):
-        self._shelf = shelve.open(filename)
-        self._memory = {}
-        if preload:
-            LOG.debug('loading cache into RAM')
-            for key in self._shelf:
-                self._memory[key] = self._shelf[key]
-            LOG.debug('loaded %d items from cache', len(self._memory))
-        self._data = collections.ChainMap(self._memory, self._shelf)
+    If ``filename`` refers to a cache created with the older
+    shelve-based implementation, the SQLite database is created
+    beside it and the old file is used as a fallback for reads.
+    Values found there are copied into the new database.
 
-    def __contains__(self, key):
-        return self._mk_key(key) in self._data
+    """
+
+    def __init__(self, filename, max_entries=10000, max_bytes=None,
+                 batch_size=100):
+        self._batch_size = batch_size
+        self._legacy = None
+        db_filename = filename
+        if dbm.whichdb(filename):
+            LOG.debug('found legacy cache %s', filename)
+            self._legacy = shelve.open(filename, flag='w')
+            db_filename = filename + '.sqlite'
+        self._conn = sqlite3.connect(db_filename)
+        self._conn.execute('pragma journal_mode=wal')
+        self._conn.execute('pragma synchronous=normal')
+        for table in _NAMESPACES + (_MISC_TABLE,):
+            self._conn.execute(SQL_CREATE.format(table=table))
+        self._pending = {}
+        self._memory = MemoryTier(max_entries, max_bytes)
+        self._finalizer = weakref.finalize(
+            self, _close, self._conn, self._pending, self._legacy)
 
     def _mk_key(self, key):
         return ':'.join(str(k) for k in key)
 
+    def _split_key(self, key):
+        "Return the table name and row id for the key."
+        namespace = str(key[0])
+        if namespace in _NAMESPACES:
+            return (namespace, ':'.join(str(k) for k in key[1:]))
+        return (_MISC_TABLE, self._mk_key(key))
+
+    def _select(self, real_key):
+        table, id_ = real_key
+        row = self._conn.execute(
+            'select value from {} where id = ?'.format(table),
+            (id_,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(real_key)
+        value = pickle.loads(row[0])
+        self._memory.put(real_key, value, len(row[0]))
+        return value
+
+    def _lookup(self, key):
+        real_key = self._split_key(key)
+        try:
+            return self._memory.get(real_key)
+        except KeyError:
+            pass
+        if real_key in self._pending:
+            pickled = self._pending[real_key]
+            value = pickle.loads(pickled)
+            self._memory.put(real_key, value, len(pickled))
+            return value
+        try:
+            return self._select(real_key)
+        except KeyError:
+            if self._legacy is None:
+                raise
+        value = self._legacy[self._mk_key(key)]
+        LOG.debug('copying %s from legacy cache', real_key)
+        self[key] = value
+        return value
+
+    def __contains__(self, key):
+        real_key = self._split_key(key)
+        if real_key in self._memory or real_key in self._pending:
+            return True
+        table, id_ = real_key
+        row = self._conn.execute(
+            'select 1 from {} where id = ?'.format(table),
+            (id_,),
+        ).fetchone()
+        if row is not None:
+            return True
+        if self._legacy is not None:
+            return self._mk_key(key) in self._legacy
+        return False
+
     def __setitem__(self, key, value):
-        self._shelf[self._mk_key(key)] = value
+        real_key = self._split_key(key)
+        pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._pending[real_key] = pickled
+        self._memory.put(real_key, value, len(pickled))
+        if len(self._pending) >= self._batch_size:
+            self.flush()
 
     def __getitem__(self, key):
-        return self._data[self._mk_key(key)]
+        return self._lookup(key)
 
     def __delitem__(self, key):
-        real_key = self._mk_key(key)
-        if real_key in self._shelf:
-            del self._shelf[real_key]
-        if real_key in self._memory:
-            del self._memory[real_key]
+        real_key = self._split_key(key)
+        self.flush()
+        table, id_ = real_key
+        with self._conn:
+            self._conn.execute(
+                'delete from {} where id = ?'.format(table),
+                (id_,),
+            )
+        if self._legacy is not None:
+            legacy_key = self._mk_key(key)
+            if legacy_key in self._legacy:
+                del self._legacy[legacy_key]
+        self._memory.discard(real_key)
+
+    @property
+    def stats(self):
+        "Hit, miss, and eviction counters for the memory tier."
+        return self._memory.stats
+
+    def flush(self):
+        "Write any buffered values to the database."
+        _flush(self._conn, self._pending)
+
+    def close(self):
+        "Write any buffered values and close the database."
+        self._finalizer()
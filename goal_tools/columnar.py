@@ -0,0 +1,292 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Store tables of strings by column.
+
+The file starts with MAGIC, then the length of a JSON header as a
+4-byte little-endian integer, then the header itself. The header
+gives the number of rows and, for each column, its name, the list of
+distinct values in the column, and the array typecode and file offset
+of the codes for the column. Each code is the index of the row's value
+in the list of distinct values. The code arrays are stored in
+little-endian order after the header, and are memory-mapped when the
+file is read.
+
+"""
+
+import array
+import csv
+import itertools
+import json
+import logging
+import mmap
+import operator
+import struct
+import sys
+
+LOG = logging.getLogger(__name__)
+
+MAGIC = b'GTCOLS01'
+
+_LENGTH = struct.Struct('<I')
+
+# Typecodes for the code arrays, smallest first.
+_TYPECODES = ('B', 'H', 'I')
+
+# Code arrays start on a multiple of this many bytes.
+_ALIGN = 8
+
+
+def _typecode_for(num_values):
+    for typecode in _TYPECODES:
+        if num_values <= 2 ** (8 * array.array(typecode).itemsize):
+            return typecode
+    raise ValueError('too many distinct values: {}'.format(num_values))
+
+
+def make_row_test(where):
+    """Combine tests of column values into one test of a row.
+
+    The result of the tests for each combination of values is
+    remembered, so after the first few rows each row costs one
+    dictionary lookup.
+
+    :param where: Functions taking a value from the column and
+        returning whether to keep the row, by column name.
+    :type where: dict
+
+    """
+    names = sorted(where)
+    tests = [where[name] for name in names]
+    get_key = operator.itemgetter(*names)
+    if len(names) == 1:
+        test = tests[0]
+    else:
+        def test(key):
+            return all(t(value) for t, value in zip(tests, key))
+    results = {}
+
+    def row_test(row):
+        key = get_key(row)
+        try:
+            return results[key]
+        except KeyError:
+            result = results[key] = bool(test(key))
+            return result
+
+    return row_test
+
+
+def is_columnar(filename):
+    "Is the file in the columnar format?"
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write(filename, columns, rows):
+    """Write the rows to a new columnar file.
+
+    :param filename: The file to create.
+    :type filename: str
+    :param columns: The names of the columns.
+    :type columns: list(str)
+    :param rows: Dicts mapping the column names to string values.
+    :type rows: iterable(dict)
+
+    """
+    lookups = [{} for c in columns]
+    codes = [array.array('I') for c in columns]
+    num_rows = 0
+    for row in rows:
+        for name, lookup, column_codes in zip(columns, lookups, codes):
+            value = row[name]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+            column_codes.append(code)
+        num_rows += 1
+
+    # Work out where each array goes before writing anything. The
+    # header length depends on the offsets, so repeat until it is
+    # stable.
+    encoded = []
+    for lookup, column_codes in zip(lookups, codes):
+        typecode = _typecode_for(len(lookup))
+        data = array.array(typecode, column_codes)
+        if sys.byteorder != 'little':
+            data.byteswap()
+        encoded.append((typecode, data.tobytes()))
+    offsets = [0] * len(columns)
+    while True:
+        header = json.dumps({
+            'rows': num_rows,
+            'columns': [
+                {'name': name,
+                 'values': list(lookup),
+                 'typecode': typecode,
+                 'offset': offset}
+                for name, lookup, (typecode, data), offset
+                in zip(columns, lookups, encoded, offsets)
+            ],
+        }).encode('utf-8')
+        position = len(MAGIC) + _LENGTH.size + len(header)
+        new_offsets = []
+        for typecode, data in encoded:
+            position += -position % _ALIGN
+            new_offsets.append(position)
+            position += len(data)
+        if new_offsets == offsets:
+            break
+        offsets = new_offsets
+
+    LOG.debug('writing %d rows to %s', num_rows, filename)
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header)))
+        f.write(header)
+        for (typecode, data), offset in zip(encoded, offsets):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(data)
+
+
+class Table:
+    """A columnar file opened for reading.
+
+    The code arrays are memory-mapped rather than read, so opening a
+    large file is cheap and the operating system shares the pages
+    between processes reading the same file.
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError('{} is not a columnar file'.format(filename))
+        start = len(MAGIC) + _LENGTH.size
+        header_length, = _LENGTH.unpack(self._mmap[len(MAGIC):start])
+        header = json.loads(
+            self._mmap[start:start + header_length].decode('utf-8'))
+        self._num_rows = header['rows']
+        self.columns = [c['name'] for c in header['columns']]
+        self._values = {}
+        self._codes = {}
+        self._view = view = memoryview(self._mmap)
+        for column in header['columns']:
+            typecode = column['typecode']
+            size = array.array(typecode).itemsize * self._num_rows
+            offset = column['offset']
+            data = view[offset:offset + size]
+            if sys.byteorder == 'little':
+                codes = data.cast(typecode)
+            else:
+                codes = array.array(typecode, data.tobytes())
+                codes.byteswap()
+            self._values[column['name']] = column['values']
+            self._codes[column['name']] = codes
+
+    def __len__(self):
+        return self._num_rows
+
+    def values(self, name):
+        "Return the list of distinct values in the column."
+        return self._values[name]
+
+    def codes(self, name):
+        "Return the sequence of value indexes for the rows in the column."
+        return self._codes[name]
+
+    def column(self, name):
+        "Iterate over the values in the column."
+        values = self._values[name]
+        return (values[code] for code in self._codes[name])
+
+    def select(self, where):
+        """Return the indexes of the rows that pass the tests.
+
+        Each test is applied once to each distinct value in its
+        column, and the rows are then selected by their codes.
+
+        :param where: Functions taking a value from the column and
+            returning whether to keep the row, by column name.
+        :type where: dict
+
+        """
+        selected = None
+        for name, test in where.items():
+            allowed = bytes(bool(test(v)) for v in self._values[name])
+            codes = self._codes[name]
+            if selected is None:
+                selected = list(itertools.compress(
+                    range(self._num_rows),
+                    map(allowed.__getitem__, codes),
+                ))
+            else:
+                selected = [i for i in selected if allowed[codes[i]]]
+        if selected is None:
+            return range(self._num_rows)
+        return selected
+
+    def rows(self, where=None):
+        """Iterate over the rows as dicts.
+
+        :param where: Functions taking a value from the column and
+            returning whether to keep the row, by column name.
+        :type where: dict
+
+        """
+        names = self.columns
+        if not where:
+            columns = [self.column(name) for name in names]
+            for row in zip(*columns):
+                yield dict(zip(names, row))
+            return
+        columns = [(self._values[name], self._codes[name]) for name in names]
+        for i in self.select(where):
+            yield dict(zip(
+                names,
+                [values[codes[i]] for values, codes in columns],
+            ))
+
+    def close(self):
+        for codes in self._codes.values():
+            if isinstance(codes, memoryview):
+                codes.release()
+        self._codes.clear()
+        self._view.release()
+        self._mmap.close()
+
+
+def read_rows(filename, where=None):
+    """Iterate over the rows of a columnar or CSV file as dicts.
+
+    :param filename: The file to read.
+    :type filename: str
+    :param where: Functions taking a value from the column and
+        returning whether to keep the row, by column name.
+    :type where: dict
+
+    """
+    if is_columnar(filename):
+        table = Table(filename)
+        try:
+            yield from table.rows(where)
+        finally:
+            table.close()
+    else:
+        with open(filename, 'r', encoding='utf-8') as f:
+            rows = csv.DictReader(f)
+            if where:
+                rows = filter(make_row_test(where), rows)
+            yield from rows
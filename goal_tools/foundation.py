@@ -10,17 +10,28 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import bisect
 import datetime
-import functools
 import logging
 
 from goal_tools import apis
+from goal_tools import caching
 
 LOG = logging.getLogger(__name__)
 
 # The OpenStack foundation member directory lookup API endpoint
 MEMBER_LOOKUP_URL = 'https://openstackid-resources.openstack.org/'
 
+# The number of addresses to combine into one member directory query.
+MEMBER_BATCH_SIZE = 50
+
+# Stop splitting a batch to find out who the members are once more
+# than one address in this many belongs to a member.
+_SPLIT_RATIO = 4
+
+# How long to trust a cached entry saying someone is not a member.
+MISS_TTL = datetime.timedelta(days=30)
+
 
 class Affiliation:
     "A Foundation member relationship to an employer"
@@ -87,6 +98,9 @@ class Member:
     def __init__(self, email, data):
         self.email = email
         self._data = data
+        # Built on first use by find_affiliation().
+        self._index = None
+        self._by_day = {}
 
     @property
     def name(self):
@@ -103,15 +117,67 @@ class Member:
             if affiliation.is_current:
                 return affiliation
 
+    def _build_index(self):
+        """Split time into intervals where the same affiliation applies.
+
+        Every start date and the day after every end date is a point
+        where the answer from find_affiliation() may change. Between
+        those points the answer is fixed, so it is computed once for
+        each interval and looked up with a binary search.
+
+        """
+        one_day = datetime.timedelta(days=1)
+        spans = []
+        points = set()
+        for affiliation in self.affiliations:
+            start = affiliation.start_date
+            end = affiliation.end_date
+            if start:
+                start = start.date()
+                points.add(start)
+            if end:
+                end = end.date()
+                points.add(end + one_day)
+            spans.append((start, end, affiliation))
+        points = sorted(points)
+
+        def winner(day):
+            # The last active affiliation in the list wins.
+            for start, end, affiliation in reversed(spans):
+                if start and start > day:
+                    continue
+                if end and end < day:
+                    continue
+                return affiliation
+            return None
+
+        if points:
+            days = [points[0] - one_day] + points
+        else:
+            days = [None]
+        self._index = (points, [winner(day) for day in days])
+
     def find_affiliation(self, when):
-        candidates = [
-            affiliation
-            for affiliation in self.affiliations
-            if affiliation.active(when)
-        ]
-        if candidates:
-            return candidates[-1]
-        return None
+        """Return the affiliation in effect on the date specified.
+
+        If more than one affiliation matches, the last one in the
+        member data is used. Only the date portion of when is used.
+
+        :param when: The date to check
+        :type when: datetime.datetime
+
+        """
+        day = when.date()
+        try:
+            return self._by_day[day]
+        except KeyError:
+            pass
+        if self._index is None:
+            self._build_index()
+        points, winners = self._index
+        result = winners[bisect.bisect_right(points, day)]
+        self._by_day[day] = result
+        return result
 
 
 def lookup_member(email):
@@ -136,29 +202,203 @@ def lookup_member(email):
         return None
 
 
+def _query_members(emails):
+    "Return the member records matching any of the addresses."
+    records = []
+    page = 1
+    while True:
+        raw = apis.requester(
+            MEMBER_LOOKUP_URL + '/api/public/v1/members',
+            params={
+                'filter[]': [
+                    'group_slug==foundation-members',
+                    ','.join('email==' + e for e in emails),
+                ],
+                'expand': 'all_affiliations',
+                'page': page,
+                'per_page': 100,
+            },
+            headers={'Accept': 'application/json'},
+        )
+        decoded = apis.decode_json(raw)
+        records.extend(decoded.get('data', []))
+        if page >= decoded.get('last_page', 1):
+            break
+        page += 1
+    return records
+
+
+def _match_members(emails, records, found):
+    """Work out which of the addresses the records belong to.
+
+    The public API does not include addresses in the member records,
+    so when a query for several addresses finds anyone, the addresses
+    are split in half and each half is queried separately. Halves
+    without members are dropped after one query, so this is cheap when
+    few of the addresses belong to members.
+
+    When many of them do, splitting would cost more requests than
+    looking up each address on its own, so that is done instead.
+
+    """
+    if not records:
+        return
+    if len(emails) == 1:
+        found[emails[0]] = records[0]
+        return
+    if len(records) * _SPLIT_RATIO > len(emails):
+        _match_each(emails, records, found)
+        return
+    half = len(emails) // 2
+    first, second = emails[:half], emails[half:]
+    first_records = _query_members(first)
+    _match_members(first, first_records, found)
+    if first_records:
+        second_records = _query_members(second)
+    else:
+        # Everyone found by the larger query is in the second half.
+        second_records = records
+    _match_members(second, second_records, found)
+
+
+def _match_each(emails, records, found):
+    """Look up the addresses one at a time.
+
+    Once every record from the batch query has been claimed the rest
+    of the addresses are not members, and a single record left over
+    for the last address is its own, so neither needs a request.
+
+    """
+    unmatched = list(records)
+    for i, email in enumerate(emails):
+        if not unmatched:
+            break
+        if i == len(emails) - 1:
+            found[email] = unmatched[0]
+            break
+        data = lookup_member(email)
+        if data is not None:
+            found[email] = data
+            if data in unmatched:
+                unmatched.remove(data)
+
+
+def lookup_members(emails):
+    """Query the OSF member directory API for several people at once.
+
+    The addresses are combined into one OR filter and all pages of
+    results are read. Returns a dict mapping the addresses that were
+    found to the member data.
+
+    """
+    emails = list(emails)
+    LOG.debug('looking up %d members', len(emails))
+    found = {}
+    if emails:
+        _match_members(emails, _query_members(emails), found)
+    return found
+
+
+def make_miss_entry(when=None):
+    "Return the cache entry recording that someone is not a member."
+    return {'_not_member': when or datetime.datetime.utcnow()}
+
+
+def is_miss_entry(data):
+    "Does the cached member data record someone who is not a member?"
+    return isinstance(data, dict) and '_not_member' in data
+
+
+def miss_entry_age(data, now=None):
+    "Return how long ago the miss entry was recorded, as a timedelta."
+    return (now or datetime.datetime.utcnow()) - data['_not_member']
+
+
 class MemberFactory:
+    """Find Foundation members by email address.
+
+    People who are not members are recorded in the cache too, and
+    those entries are trusted for ``miss_ttl`` (a timedelta) before
+    the address is looked up again.
 
-    def __init__(self, cache):
+    """
+
+    def __init__(self, cache, miss_ttl=MISS_TTL):
         self._cache = cache
+        self._miss_ttl = miss_ttl
+        # Addresses we know are not in the member directory.
+        self._missing = set()
+
+    def _fetch_cached(self, email):
+        """Return (known, data) for the address.
+
+        ``known`` is false when the address needs to be looked up.
+
+        """
+        if email in self._missing:
+            return (True, None)
+        key = ('member', email)
+        if key not in self._cache:
+            return (False, None)
+        data = self._cache[key]
+        if not is_miss_entry(data):
+            LOG.debug('found %s cached', email)
+            return (True, data)
+        if miss_entry_age(data) < self._miss_ttl:
+            LOG.debug('found %s cached as not a member', email)
+            self._missing.add(email)
+            return (True, None)
+        LOG.debug('rechecking %s', email)
+        return (False, None)
+
+    def _store(self, email, data):
+        key = ('member', email)
+        if data:
+            self._cache[key] = data
+        else:
+            self._cache[key] = make_miss_entry()
+            self._missing.add(email)
 
-    @functools.lru_cache(maxsize=1024)
+    @caching.memoize(maxsize=4096)
     def fetch(self, email):
         """Find the member in the cache or look it up in the API.
 
         :param email: Email address of the member to look for.
         :type email: str
-        :param cache: Storage for repeated lookups.
-        :type cache: goal_tools.cache.Cache
 
         """
-        key = ('member', email)
-        if key in self._cache:
-            LOG.debug('found %s cached', email)
-            data = self._cache[key]
-        else:
+        known, data = self._fetch_cached(email)
+        if not known:
             data = lookup_member(email)
-            if data:
-                self._cache[key] = data
+            self._store(email, data)
         if data:
             return Member(email, data)
         return None
+
+    def fetch_many(self, emails, batch_size=MEMBER_BATCH_SIZE):
+        """Find several members in the cache or look them up in the API.
+
+        The addresses missing from the cache are looked up in batches
+        of batch_size. Returns a dict mapping each address to a
+        Member, or to None for someone who is not a member.
+
+        :param emails: Email addresses of the members to look for.
+        :type emails: iterable(str)
+        :param batch_size: The number of addresses per API query.
+        :type batch_size: int
+
+        """
+        emails = set(emails)
+        to_find = [
+            email
+            for email in emails
+            if not self._fetch_cached(email)[0]
+        ]
+        for start in range(0, len(to_find), batch_size):
+            batch = to_find[start:start + batch_size]
+            found = lookup_members(batch)
+            for email in batch:
+                self._store(email, found.get(email))
+        # Return the same Member objects as fetch(), so the
+        # affiliation index each one builds is reused.
+        return {email: self.fetch(email) for email in emails}
@@ -11,10 +11,15 @@
 # under the License.
 
 import collections
+from concurrent import futures
 import datetime
 import fileinput
+import functools
+import itertools
+import json
 import logging
 import urllib.parse
+import zlib
 
 from goal_tools import apis
 
@@ -32,6 +37,17 @@ QUERY_OPTIONS = [
     'DETAILED_LABELS',
 ]
 
+# The format of timestamps in gerrit, without the fractional seconds.
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# The number of reviews to ask for in each ReviewFactory.prefetch()
+# query.
+PREFETCH_BATCH_SIZE = 250
+
+# Cache key namespace for the markers kept next to unmerged reviews,
+# so finding them does not mean loading every cached review.
+_OPEN_NAMESPACE = 'open-review'
+
 
 def parse_review_id(line):
     parsed = urllib.parse.urlparse(line)
@@ -64,35 +80,265 @@ def parse_review_lists(filenames):
         yield parse_review_id(line)
 
 
-def query_gerrit(method, params={}):
-    """Query the Gerrit REST API"""
+def _request_gerrit(method, params={}, headers={}, stream=False):
+    "Send a request to the Gerrit REST API and return the response."
     url = GERRIT_API_URL + method
     LOG.debug('fetching %s', url)
-    raw = apis.requester(
-        url, params=params,
-        headers={'Accept': 'application/json'})
+    all_headers = {'Accept': 'application/json'}
+    all_headers.update(headers)
+    return apis.requester(
+        url, params=params, headers=all_headers, stream=stream)
+
+
+def query_gerrit(method, params={}):
+    """Query the Gerrit REST API"""
+    raw = _request_gerrit(method, params=params)
     return apis.decode_json(raw)
 
 
+def _query_detail(review_id):
+    "Return the details of one review from the API."
+    return query_gerrit(
+        'changes/' + str(review_id) + '/detail',
+        params={
+            'o': QUERY_OPTIONS,
+        },
+    )
+
+
+def _page_params(query_string, batch_size, offset):
+    return {
+        'n': str(batch_size),
+        'start': offset,
+        'q': query_string,
+        'o': QUERY_OPTIONS,
+    }
+
+
+def _query_page(query_string, batch_size, offset):
+    "Return one page of changes matching the query."
+    changes = query_gerrit(
+        'changes/',
+        params=_page_params(query_string, batch_size, offset),
+    )
+    LOG.debug('%d changes at offset %d', len(changes), offset)
+    return changes
+
+
+def _stream_page(query_string, batch_size, offset):
+    "Generator for one page of changes, decoded as they arrive."
+    raw = _request_gerrit(
+        'changes/',
+        params=_page_params(query_string, batch_size, offset),
+        stream=True,
+    )
+    try:
+        yield from apis.iter_json_array(raw)
+    finally:
+        raw.close()
+
+
+def _has_more(changes):
+    return bool(changes) and changes[-1].get('_more_changes', False)
+
+
+def _query_changes(query_string, batch_size=200, lookahead=0, stream=False):
+    """Generator for the raw data of changes matching the query.
+
+    When stream is true, each page is decoded as it is read so only
+    about one change is held in memory at a time. Otherwise, when
+    lookahead is more than 0, up to that many pages after the one
+    being processed are requested in the background. The changes are
+    always produced in the order gerrit returns them.
+
+    """
+    if stream:
+        offset = 0
+        while True:
+            last = None
+            for change in _stream_page(query_string, batch_size, offset):
+                last = change
+                yield change
+            if last is None or not last.get('_more_changes', False):
+                break
+            offset += batch_size
+        return
+
+    if lookahead <= 0:
+        offset = 0
+        while True:
+            changes = _query_page(query_string, batch_size, offset)
+            yield from changes
+            if not _has_more(changes):
+                break
+            offset += batch_size
+        return
+
+    with futures.ThreadPoolExecutor(max_workers=lookahead) as pool:
+        pages = collections.deque()
+        offsets = itertools.count(0, batch_size)
+
+        def request_page():
+            pages.append(pool.submit(
+                _query_page, query_string, batch_size, next(offsets)))
+
+        for i in range(lookahead + 1):
+            request_page()
+
+        while pages:
+            changes = pages.popleft().result()
+            more = _has_more(changes)
+            if more:
+                # Keep the pipeline full while this page is used.
+                request_page()
+            else:
+                # Anything past the last page comes back empty.
+                for page in pages:
+                    page.cancel()
+                pages.clear()
+            yield from changes
+
+
+def add_after(query_string, when):
+    """Limit a query to changes updated after a point in time.
+
+    :param query_string: The gerrit query.
+    :type query_string: str
+    :param when: The high-water mark from a previous run, or None.
+    :type when: datetime.datetime
+
+    """
+    if when is None:
+        return query_string
+    # gerrit reports times in UTC, so say so explicitly.
+    return '({}) after:"{} +0000"'.format(
+        query_string, when.strftime(TIME_FORMAT))
+
+
+@functools.lru_cache(maxsize=8192)
 def _to_datetime(s):
     "Convert a string to a datetime.datetime instance"
     # Ignore the trailing decimal seconds.
     if s is None:
         return None
+    # Gerrit always uses the same layout, "2018-04-24 10:18:51.000000000",
+    # so slice the fields out directly instead of using strptime.
+    if (len(s) >= 19 and s[4] == '-' and s[7] == '-' and s[10] == ' ' and
+            s[13] == ':' and s[16] == ':'):
+        try:
+            return datetime.datetime(
+                int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                int(s[11:13]), int(s[14:16]), int(s[17:19]),
+            )
+        except ValueError:
+            pass
     s = s.rpartition('.')[0]
-    return datetime.datetime.strptime(s, '%Y-%m-%d %H:%M:%S')
+    return datetime.datetime.strptime(s, TIME_FORMAT)
 
 
 Participant = collections.namedtuple(
     'Participant', ['role', 'name', 'email', 'date'])
 
 
+class _Participants:
+    "The people involved in a review, extracted once from the data."
+
+    __slots__ = ('owner', 'reviewers', 'uploaders', 'plus_ones')
+
+    def __init__(self, data, created):
+        owner = data.get('owner')
+        if 'email' not in owner:
+            owner['email'] = owner.get('email', 'no-reply@openstack.org')
+        self.owner = Participant(
+            'owner',
+            owner.get('name'),
+            owner.get('email'),
+            created,
+        )
+
+        labels = data.get('labels', {})
+        code_review_labels = labels.get('Code-Review', {}).get('all', [])
+        workflow_labels = labels.get('Workflow', {}).get('all', [])
+
+        reviewers = []
+        plus_ones = []
+        for label in code_review_labels:
+            value = label.get('value')
+            if value in (2, -1):
+                # Only report reviewers with negative reviews or
+                # approvals to avoid counting anyone who is just
+                # leaving lots of +1 votes without actually providing
+                # feedback.
+                role, dest = 'reviewer', reviewers
+            elif value == 1:
+                role, dest = 'plus_one', plus_ones
+            else:
+                continue
+            dest.append(Participant(
+                role,
+                label.get('name', 'Unknown Person'),
+                label.get('email', 'unknown@example.com'),
+                _to_datetime(label.get('date')),
+            ))
+        for label in workflow_labels:
+            if label.get('value', 0) != 1:
+                continue
+            reviewers.append(Participant(
+                'approver',
+                label.get('name', 'Unknown Person'),
+                label.get('email', 'unknown@example.com'),
+                _to_datetime(label.get('date')),
+            ))
+        self.reviewers = tuple(reviewers)
+        self.plus_ones = tuple(plus_ones)
+
+        # Record the owner of the patch as a known uploader so we do
+        # not emit their information again. This means someone with
+        # the "uploader" role can be counted as someone taking over a
+        # patch created by someone else to fix it in some way.
+        known_uploaders = set([owner.get('email')])
+
+        # The revision data is stored in a mapping keyed by the SHA,
+        # so in order to be consistent with how we return the
+        # uploaders we sort the revisions based on the number before
+        # we process them.
+        revisions = sorted(
+            data.get('revisions', {}).values(),
+            key=lambda x: x.get('_number', 0),
+        )
+
+        uploaders = []
+        for revision in revisions:
+            uploader = revision.get('uploader', {})
+            if 'email' not in uploader:
+                uploader['email'] = 'no-reply@openstack.org'
+            if uploader['email'] in known_uploaders:
+                # Ignore duplicates
+                continue
+            known_uploaders.add(uploader['email'])
+            uploaders.append(Participant(
+                'uploader',
+                uploader.get('name'),
+                uploader['email'],
+                _to_datetime(revision.get('created')),
+            ))
+        self.uploaders = tuple(uploaders)
+
+
 class Review:
     "The history of one code review"
 
+    __slots__ = ('_id', '_data', '_participants')
+
     def __init__(self, id, data):
         self._id = id
         self._data = data
+        self._participants = None
+
+    def _extract(self):
+        if self._participants is None:
+            self._participants = _Participants(self._data, self.created)
+        return self._participants
 
     @property
     def id(self):
@@ -110,6 +356,10 @@ class Review:
     def created(self):
         return _to_datetime(self._data.get('created'))
 
+    @property
+    def updated(self):
+        return _to_datetime(self._data.get('updated'))
+
     @property
     def is_merged(self):
         return self._data.get('status') == 'MERGED'
@@ -120,9 +370,8 @@ class Review:
 
     @property
     def participants(self):
-        yield self.owner
-        yield from self.reviewers
-        yield from self.uploaders
+        p = self._extract()
+        return (p.owner,) + p.reviewers + p.uploaders
 
     @property
     def branch(self):
@@ -130,103 +379,121 @@ class Review:
 
     @property
     def owner(self):
-        owner = self._data.get('owner')
-        if 'email' not in owner:
-            owner['email'] = owner.get('email', 'no-reply@openstack.org')
-        return Participant(
-            'owner',
-            owner.get('name'),
-            owner.get('email'),
-            self.created,
-        )
+        return self._extract().owner
 
     @property
     def uploaders(self):
-        known_uploaders = set()
+        return self._extract().uploaders
 
-        # Record the owner of the patch as a known uploader so we do
-        # not emit their information again. This means someone with
-        # the "uploader" role can be counted as someone taking over a
-        # patch created by someone else to fix it in some way.
-        owner_email = self._data.get('owner', {}).get('email')
-        known_uploaders.add(owner_email)
+    @property
+    def reviewers(self):
+        return self._extract().reviewers
 
-        # The revision data is stored in a mapping keyed by the SHA,
-        # so in order to be consistent with how we return the
-        # uploaders we sort the revisions based on the number before
-        # we process them.
-        revisions = sorted(
-            self._data.get('revisions', {}).values(),
-            key=lambda x: x.get('_number', 0),
-        )
+    @property
+    def plus_ones(self):
+        return self._extract().plus_ones
 
-        for revision in revisions:
-            uploader = revision.get('uploader', {})
-            if 'email' not in uploader:
-                uploader['email'] = 'no-reply@openstack.org'
-            if uploader['email'] in known_uploaders:
-                # Ignore duplicates
-                continue
-            known_uploaders.add(uploader['email'])
-            yield Participant(
-                'uploader',
-                uploader.get('name'),
-                uploader['email'],
-                _to_datetime(revision.get('created')),
-            )
 
-    @property
-    def reviewers(self):
-        labels = self._data.get('labels', {})
+# Version of the layout produced by slim_change(). Cached entries
+# with a different version are ignored and fetched again.
+SLIM_SCHEMA_VERSION = 1
 
-        code_review_labels = labels.get('Code-Review', {}).get('all', [])
-        for label in code_review_labels:
-            if label.get('value') not in (2, -1):
-                # Only report reviewers with negative reviews or
-                # approvals to avoid counting anyone who is just
-                # leaving lots of +1 votes without actually providing
-                # feedback.
-                continue
-            yield Participant(
-                'reviewer',
-                label.get('name', 'Unknown Person'),
-                label.get('email', 'unknown@example.com'),
-                _to_datetime(label.get('date')),
-            )
+# The fields of a label vote and uploader used by Review.
+_ACCOUNT_FIELDS = ('name', 'email')
+_VOTE_FIELDS = ('value', 'name', 'email', 'date')
 
-        workflow_labels = labels.get('Workflow', {}).get('all', [])
-        for label in workflow_labels:
-            if label.get('value', 0) != 1:
-                continue
-            yield Participant(
-                'approver',
-                label.get('name', 'Unknown Person'),
-                label.get('email', 'unknown@example.com'),
-                _to_datetime(label.get('date')),
-            )
 
-    @property
-    def plus_ones(self):
-        labels = self._data.get('labels', {})
+def _project(data, fields):
+    return {f: data[f] for f in fields if f in data}
+
+
+def slim_change(data):
+    """Return a copy of the change with only the fields Review uses.
+
+    :param data: Data structure returned by query_gerrit
+    :type data: dict
+
+    """
+    slim = _project(
+        data,
+        ('_number', 'branch', 'created', 'project', 'status', 'updated'),
+    )
+    if 'owner' in data:
+        slim['owner'] = _project(data['owner'], _ACCOUNT_FIELDS)
+    labels = data.get('labels', {})
+    slim['labels'] = {
+        name: {
+            'all': [
+                _project(vote, _VOTE_FIELDS)
+                for vote in labels[name].get('all', [])
+            ],
+        }
+        for name in ('Code-Review', 'Workflow')
+        if name in labels
+    }
+    slim['revisions'] = {
+        sha: {
+            '_number': rev.get('_number', 0),
+            'created': rev.get('created'),
+            'uploader': _project(rev.get('uploader', {}), _ACCOUNT_FIELDS),
+        }
+        for sha, rev in data.get('revisions', {}).items()
+    }
+    return slim
+
+
+def pack_change(data):
+    "Return the compressed slim form of a change for the cache."
+    encoded = json.dumps(slim_change(data), separators=(',', ':'))
+    return {
+        '_slim_schema': SLIM_SCHEMA_VERSION,
+        'payload': zlib.compress(encoded.encode('utf-8')),
+    }
+
+
+def is_packed(value):
+    "Return True if the cached value was produced by pack_change()."
+    return isinstance(value, dict) and '_slim_schema' in value
+
+
+def unpack_change(value):
+    """Return the change data from a cached value.
+
+    Full change payloads are returned unchanged. Packed values are
+    decompressed. Packed values using an older layout produce None
+    so the caller knows to fetch the change again.
+
+    """
+    if not is_packed(value):
+        return value
+    if value['_slim_schema'] != SLIM_SCHEMA_VERSION:
+        LOG.debug('ignoring cached change with schema %s',
+                  value['_slim_schema'])
+        return None
+    return json.loads(zlib.decompress(value['payload']).decode('utf-8'))
+
+
+def is_open_entry(value):
+    "Return True if the cached value is an unmerged review."
+    return isinstance(value, dict) and '_revalidate' in value
 
-        code_review_labels = labels.get('Code-Review', {}).get('all', [])
-        for label in code_review_labels:
-            if label.get('value') != 1:
-                # Other types of reviews are counted elsewhere.
-                continue
-            yield Participant(
-                'plus_one',
-                label.get('name', 'Unknown Person'),
-                label.get('email', 'unknown@example.com'),
-                _to_datetime(label.get('date')),
-            )
 
+def is_open_cached(review_id, cache):
+    """Return True if the cache holds the review as unmerged.
 
-def cache_review(review_id, data, cache):
+    Only the marker stored by cache_review() is checked, so the
+    review itself is not loaded.
+
+    """
+    return (_OPEN_NAMESPACE, str(review_id)) in cache
+
+
+def cache_review(review_id, data, cache, slim=False, etag=None):
     """Add a review to the cache.
 
-    Review data is only cached if the review is MERGED because
-    otherwise it is more likely to change.
+    MERGED reviews are cached as they are. Other reviews are more
+    likely to change, so they are stored along with their update time
+    and ETag to be revalidated before they are used again.
 
     :param review_id: Review ID of the review to look for.
     :type review_id: str
@@ -234,22 +501,116 @@ def cache_review(review_id, data, cache):
     :type data: dict
     :param cache: Storage for repeated lookups.
     :type cache: goal_tools.cache.Cache
+    :param slim: Store only the fields Review uses, compressed.
+    :type slim: bool
+    :param etag: The ETag gerrit reported for the review, if known.
+    :type etag: str
 
     """
+    key = ('review', str(review_id))
+    open_key = (_OPEN_NAMESPACE, str(review_id))
     if data.get('status') == 'MERGED':
-        cache[('review', str(review_id))] = data
+        cache[key] = pack_change(data) if slim else data
+        if open_key in cache:
+            del cache[open_key]
+    elif data.get('updated'):
+        cache[key] = {
+            '_revalidate': {
+                'updated': data['updated'],
+                'etag': etag,
+            },
+            'change': pack_change(data) if slim else data,
+        }
+        cache[open_key] = True
+
+
+def _check_fresh(review_id, entry):
+    """Ask gerrit whether a cached unmerged review is still current.
+
+    Sends a conditional request for the summary of the change, which
+    is much smaller than the details. If the ETag does not match, or
+    we do not have one yet, the update time is compared instead.
+
+    Returns a tuple with a boolean indicating whether the entry can
+    be used and the latest ETag.
+
+    """
+    info = entry['_revalidate']
+    headers = {}
+    if info.get('etag'):
+        headers['If-None-Match'] = info['etag']
+    raw = _request_gerrit('changes/' + str(review_id), headers=headers)
+    etag = raw.headers.get('ETag', info.get('etag'))
+    if raw.status_code == 304:
+        return (True, etag)
+    summary = apis.decode_json(raw)
+    return (summary.get('updated') == info['updated'], etag)
+
+
+def _load_review(review_id, entry=None):
+    """Return the details of the review.
+
+    If entry is a cached unmerged review that is still current, use
+    it instead of downloading the details again.
+
+    Returns a tuple of the review data, the ETag, and a boolean
+    indicating whether the data came from the entry.
+
+    """
+    if entry is not None:
+        fresh, etag = _check_fresh(review_id, entry)
+        if fresh:
+            data = unpack_change(entry['change'])
+            if data is not None:
+                LOG.debug('cached %s is current', review_id)
+                return (data, etag, True)
+        LOG.debug('cached %s is out of date', review_id)
+    return (_query_detail(review_id), None, False)
 
 
 class ReviewFactory:
 
-    def __init__(self, cache):
+    def __init__(self, cache, slim=False):
         self._cache = cache
+        self._slim = slim
+        # Changes found by prefetch() that are not in the cache.
+        self._prefetched = {}
+
+    def _fetch_cached(self, review_id):
+        """Look for the review in the cache.
+
+        Returns a tuple of the Review, if the cache holds a usable
+        copy, and the cached entry for an unmerged review that needs
+        to be revalidated before it can be used.
+
+        """
+        data = self._prefetched.pop(str(review_id), None)
+        if data is not None:
+            return (Review(review_id, data), None)
+        key = ('review', str(review_id))
+        if key in self._cache:
+            value = self._cache[key]
+            if is_open_entry(value):
+                return (None, value)
+            data = unpack_change(value)
+            if data is not None:
+                LOG.debug('found %s cached', review_id)
+                return (Review(review_id, data), None)
+        return (None, None)
+
+    def _store(self, review_id, result, entry):
+        "Save the results of _load_review() in the cache."
+        data, etag, reused = result
+        if reused and etag == entry['_revalidate'].get('etag'):
+            # Nothing has changed.
+            return
+        cache_review(review_id, data, self._cache, self._slim, etag)
 
     def fetch(self, review_id):
         """Find the review in the cache or look it up in the API.
 
-        Review data is only cached if the review is MERGED because
-        otherwise it is more likely to change.
+        Unmerged reviews found in the cache are revalidated before
+        they are used.
 
         :param review_id: Review ID of the review to look for.
         :type review_id: str
@@ -257,49 +618,144 @@ class ReviewFactory:
         :type cache: goal_tools.cache.Cache
 
         """
-        key = ('review', str(review_id))
-        if key in self._cache:
-            LOG.debug('found %s cached', review_id)
-            return Review(review_id, self._cache[key])
-        data = query_gerrit(
-            'changes/' + review_id + '/detail',
-            params={
-                'o': QUERY_OPTIONS,
-            },
-        )
-        response = Review(review_id, data)
-        cache_review(review_id, data, self._cache)
+        response, entry = self._fetch_cached(review_id)
+        if response is None:
+            result = _load_review(review_id, entry)
+            self._store(review_id, result, entry)
+            response = Review(review_id, result[0])
         return response
 
-    def query(self, query_string):
-        "Generator for changes matching the query criteria."
-        batch_size = 200
-        offset = 0
-        while True:
-            changes = query_gerrit(
-                'changes/',
-                params={
-                    'n': str(batch_size),
-                    'start': offset,
-                    'q': query_string,
-                    'o': QUERY_OPTIONS,
-                },
+    def fetch_many(self, review_ids, workers=8):
+        """Generator of Reviews for the IDs, fetched in parallel.
+
+        Reviews missing from the cache, or needing to be revalidated,
+        are looked up using a pool of worker threads. The results are
+        added to the cache as they arrive, but the Reviews are
+        produced in the same order as the input IDs.
+
+        :param review_ids: Iterable of review IDs to look for.
+        :type review_ids: iterable(str)
+        :param workers: The number of concurrent API requests.
+        :type workers: int
+
+        """
+        if workers <= 1:
+            for review_id in review_ids:
+                yield self.fetch(review_id)
+            return
+
+        # Limit how far ahead of the consumer we read, so we do not
+        # queue up requests for every review at once.
+        max_pending = workers * 4
+
+        # (review_id, Review or Future) in input order
+        window = collections.deque()
+        # Future -> (review_id, entry) for results not yet added to
+        # the cache
+        in_flight = {}
+
+        def store(future):
+            review_id, entry = in_flight.pop(future)
+            self._store(review_id, future.result(), entry)
+
+        def store_done():
+            for future in [f for f in in_flight if f.done()]:
+                if future.exception() is None:
+                    store(future)
+                else:
+                    # Leave the error to be reported in order.
+                    in_flight.pop(future)
+
+        def ready(item):
+            return not isinstance(item, futures.Future) or item.done()
+
+        def next_review():
+            review_id, item = window.popleft()
+            if not isinstance(item, futures.Future):
+                return item
+            data = item.result()[0]
+            if item in in_flight:
+                store(item)
+            return Review(review_id, data)
+
+        with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            for review_id in review_ids:
+                review, entry = self._fetch_cached(review_id)
+                if review is None:
+                    future = pool.submit(_load_review, review_id, entry)
+                    in_flight[future] = (review_id, entry)
+                    window.append((review_id, future))
+                else:
+                    window.append((review_id, review))
+                store_done()
+                while window and (len(window) > max_pending or
+                                  ready(window[0][1])):
+                    yield next_review()
+            while window:
+                yield next_review()
+                store_done()
+
+    def prefetch(self, review_ids, batch_size=PREFETCH_BATCH_SIZE):
+        """Look up the reviews missing from the cache in batches.
+
+        Instead of one request per review, the IDs are combined into
+        queries of up to batch_size changes each. The results are
+        added to the cache as usual. Unmerged reviews are also held in
+        memory so a later call to fetch() does not check them again.
+
+        :param review_ids: Iterable of review IDs to look for.
+        :type review_ids: iterable(str)
+        :param batch_size: The number of reviews to ask for per query.
+        :type batch_size: int
+
+        """
+        def is_missing(review_id):
+            # Unmerged reviews are included because asking for them
+            # again in a batch is cheaper than revalidating each one.
+            return (('review', review_id) not in self._cache or
+                    is_open_cached(review_id, self._cache))
+
+        missing = [
+            str(review_id)
+            for review_id in review_ids
+            if is_missing(str(review_id))
+        ]
+        LOG.debug('prefetching %d reviews', len(missing))
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            query_string = ' OR '.join('change:' + r for r in batch)
+            for change in _query_changes(query_string, batch_size):
+                review_id = str(change['_number'])
+                cache_review(review_id, change, self._cache, self._slim)
+                if change.get('status') != 'MERGED':
+                    self._prefetched[review_id] = change
+
+    def query(self, query_string, page_size=200, lookahead=0,
+              stream=False):
+        """Generator for changes matching the query criteria.
+
+        :param query_string: The gerrit query.
+        :type query_string: str
+        :param page_size: The number of changes to ask for per request.
+        :type page_size: int
+        :param lookahead: The number of pages to request ahead of the
+            one being processed.
+        :type lookahead: int
+        :param stream: Decode the changes as they arrive instead of a
+            page at a time. Ignores lookahead.
+        :type stream: bool
+
+        """
+        changes = _query_changes(query_string, page_size, lookahead, stream)
+        for change in changes:
+            review = Review(
+                change['_number'],
+                change,
             )
-            LOG.debug('%d changes', len(changes))
-
-            for change in changes:
-                review = Review(
-                    change['_number'],
-                    change,
-                )
-                cache_review(
-                    review.id,
-                    review.raw_change,
-                    self._cache,
-                )
-                yield review
-
-            if changes and changes[-1].get('_more_changes', False):
-                offset += batch_size
-            else:
-                break
+            cache_review(
+                review.id,
+                review.raw_change,
+                self._cache,
+                self._slim,
+            )
+            yield review
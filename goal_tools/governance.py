@@ -13,40 +13,130 @@
 """Work with the governance repository.
 """
 
-import functools
-
-import yaml
+import hashlib
+import logging
+import os
+import threading
 
 from goal_tools import apis
+from goal_tools import caching
+from goal_tools import yamlutils
+
+LOG = logging.getLogger(__name__)
 
 PROJECTS_LIST = "http://git.openstack.org/cgit/openstack/governance/plain/reference/projects.yaml"  # noqa
 TC_LIST = "http://git.openstack.org/cgit/openstack/governance/plain/reference/technical-committee-repos.yaml"  # noqa
 SIGS_LIST = "http://git.openstack.org/cgit/openstack/governance/plain/reference/sigs-repos.yaml"  # noqa
 
+# Where the governance data is saved between runs.
+CACHE_DIR = caching.USER_CACHE
+
+# Change this when _organize_team_data() changes, so data saved by an
+# older version is organized again.
+_SAVED_VERSION = 1
+
+# Team data already loaded by this process, by source URLs.
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def _fetch_source(url, previous):
+    """Download and parse a YAML file unless the saved copy is current.
+
+    Returns previous when the server says the file has not changed,
+    otherwise a new dict with the parsed data and validators.
+
+    """
+    headers = {}
+    if previous:
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+    raw = apis.requester(url, headers=headers)
+    if previous and raw.status_code == 304:
+        LOG.debug('%s has not changed', url)
+        return previous
+    return {
+        'etag': raw.headers.get('ETag'),
+        'last_modified': raw.headers.get('Last-Modified'),
+        'data': yamlutils.load(raw.text),
+    }
+
+
+def _read_saved(filename):
+    saved = caching.read_pickle(filename)
+    if not isinstance(saved, dict):
+        return None
+    if saved.get('version') != _SAVED_VERSION:
+        return None
+    return saved
+
 
 class Governance:
+    """Team and repository data from the governance repository.
+
+    The organized data is saved in ``cache_dir`` and the source files
+    are only parsed again when the server reports that they have
+    changed. Data loaded once is shared by every instance in the
+    process. Pass a cache_dir of None to skip the saved copy.
+
+    """
 
     def __init__(self,
                  team_data=None,
                  url=PROJECTS_LIST,
                  tc_url=TC_LIST,
-                 sigs_url=SIGS_LIST):
+                 sigs_url=SIGS_LIST,
+                 cache_dir=CACHE_DIR):
         self._url = url
         self._tc_url = tc_url
         self._sigs_url = sigs_url
+        self._cache_dir = caching.find_cache_dir(cache_dir)
         if team_data is None:
             team_data = self._get_team_data()
         self._team_data = team_data
 
     def _get_team_data(self):
         "Return the parsed team data from the governance repository."
-        raw = apis.requester(self._url)
-        team_data = yaml.load(raw.text)
-        tc = apis.requester(self._tc_url)
-        tc_data = yaml.load(tc.text)
-        sigs = apis.requester(self._sigs_url)
-        sigs_data = yaml.load(sigs.text)
-        return self._organize_team_data(team_data, tc_data, sigs_data)
+        urls = (self._url, self._tc_url, self._sigs_url)
+        with _loaded_lock:
+            if urls not in _loaded:
+                _loaded[urls] = self._load_team_data(urls)
+            return _loaded[urls]
+
+    def _load_team_data(self, urls):
+        filename = None
+        saved = None
+        if self._cache_dir:
+            filename = os.path.join(
+                self._cache_dir,
+                'governance-{}.pickle'.format(
+                    hashlib.sha1('\n'.join(urls).encode('utf-8')).hexdigest()
+                ),
+            )
+            saved = _read_saved(filename)
+        previous = saved['sources'] if saved else {}
+        sources = {
+            url: _fetch_source(url, previous.get(url))
+            for url in urls
+        }
+        if saved and all(sources[url] is previous.get(url) for url in urls):
+            LOG.debug('using saved governance data from %s', filename)
+            return saved['team_data']
+        team_data = self._organize_team_data(
+            # Copy the top level so the saved source is not modified.
+            dict(sources[self._url]['data']),
+            sources[self._tc_url]['data'],
+            sources[self._sigs_url]['data'],
+        )
+        if filename:
+            caching.write_pickle(filename, {
+                'version': _SAVED_VERSION,
+                'sources': sources,
+                'team_data': team_data,
+            })
+        return team_data
 
     @staticmethod
     def _organize_team_data(team_data, tc_data, sigs_data):
@@ -158,13 +248,13 @@ class Governance:
             if not n.startswith('_')
         )
 
-    @functools.lru_cache()
+    @caching.memoize()
     def get_repo_owner(self, repo_name):
         "Return the name of the team that owns the repository."
         repo_info = self._team_data['_by_repos'].get(repo_name, {})
         return repo_info.get('team')
 
-    @functools.lru_cache()
+    @caching.memoize()
     def get_repo_tags(self, repo_name):
         repo_info = self._team_data['_by_repos'].get(repo_name, {})
         if not repo_info:
@@ -172,3 +262,12 @@ class Governance:
         tags = set(repo_info['deliverable_info'].get('tags', []))
         tags.update(repo_info['team_info'].get('tags', []))
         return tags
+
+    @caching.memoize()
+    def get_tagged_repos(self, tag):
+        "Return the set of repositories with the tag."
+        return set(
+            repo_name
+            for repo_name in self._team_data['_by_repos']
+            if tag in self.get_repo_tags(repo_name)
+        )
@@ -0,0 +1,129 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Group and count rows using integer codes for the values.
+
+Each column is dictionary-encoded into an array of small integers,
+the same representation used by goal_tools.columnar. The counting
+then works on the integer codes with the C-level set, zip, and
+Counter operations instead of building tuples of strings for every
+row.
+
+"""
+
+import array
+import collections
+
+
+class Encoder:
+    """Dictionary-encode columns of rows added one at a time.
+
+    :param names: The columns to encode.
+    :type names: list(str)
+
+    """
+
+    def __init__(self, names):
+        self._columns = [(name, {}, array.array('L')) for name in names]
+
+    def add(self, row):
+        "Encode the named columns of one row."
+        for name, lookup, codes in self._columns:
+            codes.append(lookup.setdefault(row[name], len(lookup)))
+
+    def extend(self, columns):
+        """Add rows whose columns are already dictionary-encoded.
+
+        Only the distinct values are looked up, and the codes of the
+        rows are translated with a list index.
+
+        :param columns: A (values, codes) pair for each of the
+            columns to encode, by column name.
+        :type columns: dict
+
+        """
+        for name, lookup, codes in self._columns:
+            values, new_codes = columns[name]
+            translate = [lookup.setdefault(v, len(lookup)) for v in values]
+            codes.extend(map(translate.__getitem__, new_codes))
+
+    def columns(self):
+        """Return a (values, codes) pair for each column.
+
+        values is the list of distinct values and codes is an array
+        with the index into values for each row.
+
+        """
+        return [(list(lookup), codes) for name, lookup, codes in self._columns]
+
+
+def encode(rows, names):
+    """Dictionary-encode columns of a sequence of rows.
+
+    Returns the columns() of an Encoder holding all of the rows.
+
+    :param rows: Dicts mapping column names to values.
+    :type rows: iterable(dict)
+    :param names: The columns to encode.
+    :type names: list(str)
+
+    """
+    encoder = Encoder(names)
+    for row in rows:
+        encoder.add(row)
+    return encoder.columns()
+
+
+def _keys(code_columns):
+    if len(code_columns) == 1:
+        return iter(code_columns[0])
+    return zip(*code_columns)
+
+
+def count(by_codes, count_codes=()):
+    """Count the rows in each group.
+
+    With no count_codes, each row is counted. Otherwise the distinct
+    combinations of the count columns are counted in each group.
+    Returns a Counter keyed by the code of the group for a single
+    column, or a tuple of codes for several.
+
+    :param by_codes: The code arrays for the columns to group by.
+    :type by_codes: list(sequence(int))
+    :param count_codes: The code arrays for the columns to count.
+    :type count_codes: list(sequence(int))
+
+    """
+    keys = _keys(by_codes)
+    if not count_codes:
+        return collections.Counter(keys)
+    pairs = set(zip(keys, _keys(count_codes)))
+    return collections.Counter(key for key, value in pairs)
+
+
+def decode(counts, by_values):
+    """Turn the group codes in the counts back into tuples of values.
+
+    :param counts: The results of count().
+    :type counts: dict
+    :param by_values: The lists of distinct values for the columns
+        the rows were grouped by.
+    :type by_values: list(list)
+
+    """
+    if len(by_values) == 1:
+        values, = by_values
+        return {(values[key],): n for key, n in counts.items()}
+    return {
+        tuple(values[code] for values, code in zip(by_values, key)): n
+        for key, n in counts.items()
+    }
@@ -0,0 +1,160 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Estimate the number of distinct values with HyperLogLog sketches.
+
+A sketch uses a fixed amount of memory no matter how many values are
+added to it, at the cost of an estimate rather than an exact count.
+The standard error of the estimate is about 1.04 / sqrt(m) for a
+sketch with m registers, so the number of registers is chosen from
+the error rate requested.
+
+Small sketches keep the hashes of their values and give exact counts
+until there is one hash for every 128 registers, so grouping by a
+column with many rare values does not allocate a full set of
+registers for every group. A set of integers takes around 100 bytes
+per entry, so that is about as much memory as the registers use.
+
+Values are hashed with blake2b rather than hash() so the results do
+not depend on the process, and sketches built separately (for
+example, one per input file) can be merged.
+
+"""
+
+import hashlib
+import math
+
+# The standard error used when none is given.
+DEFAULT_ERROR_RATE = 0.01
+
+# Joins several values into one string to add to a sketch, for
+# counting distinct combinations.
+SEPARATOR = '\x1f'
+
+_MIN_PRECISION = 4
+_MAX_PRECISION = 16
+
+_HASH_BITS = 64
+
+
+def _hash(value):
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def precision_for(error_rate):
+    """Return the number of index bits needed for the error rate.
+
+    :param error_rate: The relative standard error wanted, between 0
+        and 1.
+    :type error_rate: float
+
+    """
+    if not 0 < error_rate < 1:
+        raise ValueError(
+            'error rate must be between 0 and 1, got {}'.format(error_rate))
+    precision = math.ceil(math.log2((1.04 / error_rate) ** 2))
+    return min(max(precision, _MIN_PRECISION), _MAX_PRECISION)
+
+
+def _alpha(num_registers):
+    if num_registers == 16:
+        return 0.673
+    if num_registers == 32:
+        return 0.697
+    if num_registers == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / num_registers)
+
+
+class HyperLogLog:
+    """A sketch of a set of strings, for estimating its size.
+
+    :param error_rate: The relative standard error wanted.
+    :type error_rate: float
+
+    """
+
+    def __init__(self, error_rate=DEFAULT_ERROR_RATE):
+        self.precision = precision_for(error_rate)
+        self._num_registers = 1 << self.precision
+        # Hashes are kept until the set holding them would be larger
+        # than the registers, then replaced by them.
+        self._max_hashes = self._num_registers // 128
+        self._hashes = set()
+        self._registers = None
+
+    def __repr__(self):
+        return 'HyperLogLog(precision={}, estimate={})'.format(
+            self.precision, len(self))
+
+    def _to_registers(self):
+        self._registers = bytearray(self._num_registers)
+        for hashed in self._hashes:
+            self._set_register(hashed)
+        self._hashes = None
+
+    def _set_register(self, hashed):
+        precision = self.precision
+        index = hashed >> (_HASH_BITS - precision)
+        rest = hashed & ((1 << (_HASH_BITS - precision)) - 1)
+        rank = _HASH_BITS - precision - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def _add_hash(self, hashed):
+        if self._registers is not None:
+            self._set_register(hashed)
+            return
+        self._hashes.add(hashed)
+        if len(self._hashes) > self._max_hashes:
+            self._to_registers()
+
+    def add(self, value):
+        "Add a string to the set."
+        self._add_hash(_hash(value))
+
+    def merge(self, other):
+        """Add all of the values in another sketch to this one.
+
+        :param other: A sketch with the same precision.
+        :type other: HyperLogLog
+
+        """
+        if other.precision != self.precision:
+            raise ValueError(
+                'cannot merge sketches with precision {} and {}'.format(
+                    self.precision, other.precision))
+        if other._registers is None:
+            for hashed in other._hashes:
+                self._add_hash(hashed)
+            return
+        if self._registers is None:
+            self._to_registers()
+        self._registers = bytearray(
+            max(a, b) for a, b in zip(self._registers, other._registers))
+
+    def __len__(self):
+        "Return the estimated number of distinct values."
+        if self._registers is None:
+            return len(self._hashes)
+        num_registers = self._num_registers
+        estimate = (
+            _alpha(num_registers) * num_registers * num_registers /
+            sum(2.0 ** -r for r in self._registers)
+        )
+        if estimate <= 2.5 * num_registers:
+            # Use linear counting for small sets.
+            zeros = self._registers.count(0)
+            if zeros:
+                estimate = num_registers * math.log(num_registers / zeros)
+        return int(round(estimate))
@@ -20,10 +20,10 @@ import warnings
 
 import appdirs
 import requests
-import yaml
 
 from goal_tools import storyboard
 from goal_tools import goals
+from goal_tools import yamlutils
 
 _GOVERNANCE_PROJECT_NAME = 'openstack/governance'
 _STORY_URL_TEMPLATE = 'https://storyboard.openstack.org/#!/story/{}'
@@ -61,9 +61,9 @@ def _get_project_info(url):
     # First check to see if it's a local path we can read.
     if os.path.isfile(url):
         with open(url) as f:
-            return yaml.safe_load(f)
+            return yamlutils.load(f)
     response = requests.get(url)
-    data = yaml.safe_load(response.text)
+    data = yamlutils.load(response.text)
     return data
 
 
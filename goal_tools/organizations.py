@@ -10,18 +10,55 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import functools
 import logging
-import pkgutil
 
-import yaml
+from goal_tools import caching
+from goal_tools import yamlutils
 
 LOG = logging.getLogger(__name__)
 
-_ORG_DATA = yaml.load(
-    pkgutil.get_data('goal_tools',
-                     'organizations.yaml').decode('utf-8')
-)
+# The key in a domain trie node holding the organization name.
+_NAME = None
+
+# The key in a domain trie node holding the organization name for
+# addresses in exactly that domain, but not its subdomains.
+_EXACT_NAME = ()
+
+# Second-level labels registries share between many organizations, as
+# in "ac.th" or "co.uk".
+_SHARED_LABELS = frozenset([
+    'ac', 'co', 'com', 'edu', 'go', 'gov', 'ne', 'net', 'or', 'org',
+])
+
+
+def _is_public_suffix(labels):
+    return len(labels) <= 2 and labels[0] in _SHARED_LABELS
+
+
+def _build_domain_trie(data):
+    """Return a trie of the organization domains.
+
+    Each level is a dict keyed by one label of the domain name,
+    starting from the last, so "mail.example.com" is stored under
+    "com", "example", then "mail".
+
+    Domains such as "ac.th" that registries hand out subdomains of
+    only match addresses in that exact domain, so one entry does not
+    claim every organization below it.
+
+    """
+    trie = {}
+    for entry in data:
+        for domain in entry.get('domains', []):
+            labels = domain.lower().split('.')
+            node = trie
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            if _is_public_suffix(labels):
+                node[_EXACT_NAME] = entry['company_name']
+            else:
+                node[_NAME] = entry['company_name']
+    return trie
 
 
 class Organizations:
@@ -43,7 +80,9 @@ class Organizations:
         'infra-root@openstack.org',
     ])
 
-    def __init__(self, data=_ORG_DATA):
+    def __init__(self, data=None):
+        if data is None:
+            data = yamlutils.load_package_data('organizations.yaml')
         self._data = data
         self._reverse = {
             str(alias).lower(): entry['company_name']
@@ -54,19 +93,42 @@ class Organizations:
             str(entry['company_name']).lower(): entry['company_name']
             for entry in self._data
         })
-        self._domains = {
-            domain.lower(): entry['company_name']
-            for entry in self._data
-            for domain in entry.get('domains', [])
-        }
+        self._domain_trie = _build_domain_trie(self._data)
 
-    @functools.lru_cache(maxsize=1024)
+    @caching.memoize()
     def __getitem__(self, name):
         return self._reverse.get(name.lower(), name)
 
-    @functools.lru_cache(maxsize=1024)
+    def _from_domain(self, domain):
+        "Return the organization for the domain or its closest parent."
+        name = None
+        node = self._domain_trie
+        for label in reversed(domain.split('.')):
+            try:
+                node = node[label]
+            except KeyError:
+                return name
+            name = node.get(_NAME, name)
+        return node.get(_EXACT_NAME, name)
+
+    @caching.memoize()
     def from_email(self, email):
+        """Return the organization for an email address, or None.
+
+        Addresses at a subdomain of a known domain, such as
+        "us.example.com", belong to the organization for the domain.
+
+        """
         if email in self._BOTS:
             return 'Automation'
         domain = email.partition('@')[-1].lower()
-        return self._domains.get(domain)
+        return self._from_domain(domain)
+
+    def resolve_many(self, emails):
+        """Return a list of the organizations for a sequence of addresses.
+
+        :param emails: Email addresses to look up.
+        :type emails: iterable(str)
+
+        """
+        return [self.from_email(email) for email in emails]
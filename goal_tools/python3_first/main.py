@@ -17,7 +17,8 @@ import sys
 
 from cliff import app
 from cliff import commandmanager
-import pbr.version
+
+from goal_tools import utils
 
 
 class Python3First(app.App):
@@ -25,14 +26,22 @@ class Python3First(app.App):
     """
 
     def __init__(self):
-        version_info = pbr.version.VersionInfo('goal-tools')
         super().__init__(
-            version=version_info.version_string(),
+            version=None,
             description='tool for working on python3-first goal',
             command_manager=commandmanager.CommandManager('python3_first'),
             deferred_help=False,
         )
 
+    def build_option_parser(self, description, version,
+                            argparse_kwargs=None):
+        parser = super().build_option_parser(
+            description, version,
+            utils.version_parser_kwargs(argparse_kwargs),
+        )
+        utils.add_version_option(parser)
+        return parser
+
     def initialize_app(self, argv):
         # Quiet the urllib3 module output coming out of requests.
         logging.getLogger('urllib3').setLevel(logging.WARNING)
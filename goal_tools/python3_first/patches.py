@@ -5,12 +5,10 @@ import json
 import logging
 import os.path
 
-import appdirs
 from cliff import lister
-import requests
 
+from goal_tools import apis
 from goal_tools import governance
-from goal_tools import storyboard
 
 LOG = logging.getLogger(__name__)
 BATCH_SIZE = 300
@@ -54,7 +52,7 @@ def query_gerrit(offset=0, only_open=True, extra_query=''):
     if extra_query:
         query = query + ' ' + extra_query
     LOG.debug('querying %s %r offset %s', url, query, offset)
-    raw = requests.get(
+    raw = apis.requester(
         url,
         params={
             'n': str(BATCH_SIZE),
@@ -257,7 +255,7 @@ def search_cleanup_patches(offset=0):
         'topic:python3-first',
     ])
     LOG.debug('querying %s %r offset %s', url, query, offset)
-    raw = requests.get(
+    raw = apis.requester(
         url,
         params={
             'n': str(BATCH_SIZE),
@@ -310,6 +308,7 @@ class PatchesCount(lister.Lister):
     "count the patches open for each team"
 
     def get_parser(self, prog_name):
+        import appdirs
         parser = super().get_parser(prog_name)
         config_dir = appdirs.user_config_dir('OSGoalTools', 'OpenStack')
         config_file = os.path.join(config_dir, 'storyboard.ini')
@@ -349,6 +348,10 @@ class PatchesCount(lister.Lister):
     ]
 
     def take_action(self, parsed_args):
+        # The storyboard client is slow to import and only this
+        # command uses it.
+        from goal_tools import storyboard
+
         gov_dat = governance.Governance(url=parsed_args.project_list)
         sb_config = storyboard.get_config(parsed_args.config_file)
 
@@ -8,7 +8,6 @@ import textwrap
 from goal_tools import governance
 
 from cliff import command
-import jinja2
 
 LOG = logging.getLogger(__name__)
 
@@ -126,6 +125,9 @@ class MigrationAnnounce(command.Command):
     ''')
 
     def take_action(self, parsed_args):
+        # jinja2 is slow to import and only this command uses it.
+        import jinja2
+
         gov_dat = governance.Governance(url=parsed_args.project_list)
         repos = sorted(list(gov_dat.get_repos_for_team(parsed_args.team)))
 
@@ -8,7 +8,6 @@ import textwrap
 from goal_tools import governance
 
 from cliff import command
-import jinja2
 
 LOG = logging.getLogger(__name__)
 
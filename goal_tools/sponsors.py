@@ -10,24 +10,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import functools
 import itertools
 import logging
-import pkgutil
 
-import yaml
+from goal_tools import caching
+from goal_tools import yamlutils
 
 LOG = logging.getLogger(__name__)
 
-_SPONSOR_DATA = yaml.load(
-    pkgutil.get_data('goal_tools',
-                     'sponsors.yaml').decode('utf-8')
-)
-
 
 class Sponsors:
 
-    def __init__(self, level, data=_SPONSOR_DATA):
+    def __init__(self, level, data=None):
+        if data is None:
+            data = yamlutils.load_package_data('sponsors.yaml')
         self._data = data
         if level == 'all':
             self._names = set(
@@ -40,12 +36,12 @@ class Sponsors:
                 for n in data[level]
             )
 
-    @functools.lru_cache(maxsize=1024)
+    @caching.memoize()
     def __getitem__(self, name):
         if name.lower() in self._names:
             return name
         return '*other'
 
-    @functools.lru_cache(maxsize=1024)
+    @caching.memoize()
     def __contains__(self, name):
         return name.lower() in self._names
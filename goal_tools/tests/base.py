@@ -22,6 +22,9 @@ class TestCase(testtools.TestCase):
         super().setUp()
         self.useFixture(fixtures.NestedTempfile())
         self.tmpdir = self.useFixture(fixtures.TempDir()).path
+        # Keep files saved between runs out of the user's directory.
+        self.useFixture(fixtures.MonkeyPatch(
+            'goal_tools.caching.USER_CACHE_DIR', self.tmpdir))
         self._stdout_fixture = fixtures.StringStream('stdout')
         self.stdout = self.useFixture(self._stdout_fixture).stream
         self.useFixture(fixtures.MonkeyPatch('sys.stdout', self.stdout))
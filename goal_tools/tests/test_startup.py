@@ -0,0 +1,84 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import subprocess
+import sys
+
+from goal_tools.tests import base
+
+# Modules that are slow to import and must only be loaded by the
+# commands that use them.
+_DEFERRED = (
+    'appdirs',
+    'bs4',
+    'jinja2',
+    'pbr.version',
+    'requests',
+    'ruamel.yaml',
+    'storyboardclient',
+    'yaml',
+)
+
+# The cumulative import time allowed for an entry point, in
+# microseconds, as reported by "python -X importtime". Most of this
+# is cliff itself.
+IMPORT_BUDGET_US = 400000
+
+
+def _import_times(module):
+    "Import the module in a new interpreter and return the timings."
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         'import sys; import {}; print(" ".join(sys.modules))'.format(
+             module)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        try:
+            times[parts[2].strip()] = int(parts[1])
+        except (IndexError, ValueError):
+            # The header line.
+            continue
+    return (set(proc.stdout.split()), times)
+
+
+class TestStartup(base.TestCase):
+
+    def _check(self, module):
+        modules, times = _import_times(module)
+        self.assertEqual(set(), modules.intersection(_DEFERRED))
+        self.assertLess(times[module], IMPORT_BUDGET_US)
+
+    def test_who_helped(self):
+        self._check('goal_tools.who_helped.main')
+
+    def test_who_helped_cache(self):
+        self._check('goal_tools.who_helped.cache')
+
+    def test_python3_first(self):
+        self._check('goal_tools.python3_first.main')
+
+    def test_python3_first_repos(self):
+        self._check('goal_tools.python3_first.repos')
+
+    def test_python3_first_patches(self):
+        self._check('goal_tools.python3_first.patches')
+
+    def test_python3_train(self):
+        self._check('goal_tools.python3_train.main')
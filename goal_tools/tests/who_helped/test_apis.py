@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+
+import fixtures
+import requests_mock
+
+from goal_tools import apis
+from goal_tools.tests import base
+
+
+class TestSession(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.useFixture(fixtures.MonkeyPatch('goal_tools.apis._session', None))
+        self.useFixture(fixtures.MonkeyPatch(
+            'goal_tools.apis._session_settings',
+            dict(apis._session_settings)))
+
+    def test_shared(self):
+        self.assertIs(apis.get_session(), apis.get_session())
+
+    def test_configure_replaces(self):
+        first = apis.get_session()
+        apis.configure_session()
+        second = apis.get_session()
+        self.assertIsNot(first, second)
+        self.assertIs(second, apis.get_session())
+
+    def test_adapter_settings(self):
+        apis.configure_session(pool_maxsize=4, retries=5)
+        session = apis.get_session()
+        for prefix in ('http://', 'https://'):
+            adapter = session.get_adapter(prefix + 'example.com')
+            self.assertEqual(4, adapter._pool_maxsize)
+            self.assertEqual(5, adapter.max_retries.total)
+            self.assertIn(429, adapter.max_retries.status_forcelist)
+            self.assertTrue(adapter.max_retries.respect_retry_after_header)
+
+    def test_requester(self):
+        with requests_mock.Mocker() as m:
+            m.get('https://example.com/api', text=")]}'\n[1, 2]")
+            raw = apis.requester('https://example.com/api')
+        self.assertEqual([1, 2], apis.decode_json(raw))
+
+
+class TestIterJSONArray(base.TestCase):
+
+    _url = 'https://example.com/api'
+
+    def _stream(self, body, chunk_size=3):
+        with requests_mock.Mocker() as m:
+            m.get(self._url, text=body)
+            raw = apis.requester(self._url, stream=True)
+            return list(apis.iter_json_array(raw, chunk_size=chunk_size))
+
+    def test_prefix(self):
+        body = ")]}'\n[{\"a\": 1}, {\"b\": [2, 3]}]\n"
+        self.assertEqual([{'a': 1}, {'b': [2, 3]}], self._stream(body))
+
+    def test_no_prefix(self):
+        body = '[{"a": "x]y"}, {"b": 2}]'
+        self.assertEqual([{'a': 'x]y'}, {'b': 2}], self._stream(body))
+
+    def test_empty(self):
+        self.assertEqual([], self._stream(")]}'\n[]\n"))
+
+    def test_large_item(self):
+        items = [{'n': i, 'text': 'x' * 1000} for i in range(5)]
+        body = ")]}'\n" + json.dumps(items)
+        self.assertEqual(items, self._stream(body, chunk_size=7))
+
+    def test_multibyte(self):
+        body = '[{"name": "Renée"}]'
+        self.assertEqual([{'name': 'Renée'}], self._stream(body, 1))
+
+    def test_numbers(self):
+        body = '[1, 23, 456, -7.5e10]'
+        self.assertEqual([1, 23, 456, -7.5e10], self._stream(body, 1))
+
+    def test_not_array(self):
+        self.assertRaises(ValueError, self._stream, 'Not Found')
+
+    def test_truncated(self):
+        self.assertRaises(ValueError, self._stream, '[{"a": 1}, {"b"')
@@ -0,0 +1,93 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import json
+import pkgutil
+from unittest import mock
+
+from goal_tools import attribution
+from goal_tools import foundation
+from goal_tools import gerrit
+from goal_tools import organizations
+from goal_tools.tests import base
+
+_member_data = json.loads(
+    pkgutil.get_data('goal_tools.tests.who_helped',
+                     'data/doug.json').decode('utf-8')
+)
+
+
+def _participant(email, date):
+    return gerrit.Participant('owner', 'Someone', email, date)
+
+
+class TestAttribute(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = {('member', 'doug@doughellmann.com'): _member_data}
+        self.member_factory = foundation.MemberFactory(self.cache)
+        self.orgs = organizations.Organizations([
+            {'domains': ['example.com'], 'company_name': 'Example'},
+        ])
+        self.date = datetime.datetime(2018, 5, 1)
+
+    def _attribute(self, items, chunk_size=attribution.CHUNK_SIZE):
+        with mock.patch('goal_tools.foundation.lookup_members') as f:
+            f.return_value = {}
+            chunks = list(attribution.attribute(
+                items, self.member_factory, self.orgs,
+                chunk_size=chunk_size,
+            ))
+        return (f, chunks)
+
+    def test_organizations(self):
+        items = [
+            ('r1', _participant('doug@doughellmann.com', self.date)),
+            ('r1', _participant('someone@example.com', self.date)),
+            ('r2', _participant('nobody@nowhere.org', self.date)),
+        ]
+        f, chunks = self._attribute(items)
+        self.assertEqual(
+            [[('r1', items[0][1], 'Red Hat, Inc'),
+              ('r1', items[1][1], 'Example'),
+              ('r2', items[2][1], attribution.UNKNOWN)]],
+            chunks,
+        )
+
+    def test_chunks(self):
+        items = [
+            ('r{}'.format(i),
+             _participant('p{}@example.com'.format(i), self.date))
+            for i in range(5)
+        ]
+        f, chunks = self._attribute(items, chunk_size=2)
+        self.assertEqual([2, 2, 1], [len(c) for c in chunks])
+        self.assertEqual(
+            [r for r, p in items],
+            [r for c in chunks for r, p, o in c],
+        )
+        # One batched member lookup per chunk.
+        self.assertEqual(3, f.call_count)
+
+    def test_members_reused(self):
+        items = [
+            ('r1', _participant('doug@doughellmann.com', self.date)),
+            ('r2', _participant('doug@doughellmann.com', self.date)),
+        ]
+        with mock.patch.object(foundation.Member, 'find_affiliation',
+                               autospec=True) as find:
+            find.return_value = None
+            self._attribute(items, chunk_size=1)
+        members = set(id(call[0][0]) for call in find.call_args_list)
+        self.assertEqual(1, len(members))
@@ -0,0 +1,139 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import csv
+import io
+import os.path
+
+from goal_tools.tests import base
+from goal_tools.who_helped import batch
+from goal_tools.who_helped import main
+
+_COLUMNS = ['Review', 'Role', 'Name', 'Organization']
+
+_ROWS = [
+    {'Review': '1', 'Role': 'owner', 'Name': 'A', 'Organization': 'Red Hat'},
+    {'Review': '1', 'Role': 'reviewer', 'Name': 'B', 'Organization': 'SUSE'},
+    {'Review': '2', 'Role': 'owner', 'Name': 'A', 'Organization': 'Red Hat'},
+    {'Review': '2', 'Role': 'reviewer', 'Name': 'C', 'Organization': 'SUSE'},
+    {'Review': '3', 'Role': 'owner', 'Name': 'D', 'Organization': 'SUSE'},
+]
+
+
+class TestLoadSpec(base.TestCase):
+
+    def _write(self, text):
+        filename = os.path.join(self.tmpdir, 'spec.yaml')
+        with open(filename, 'w') as f:
+            f.write(text)
+        return filename
+
+    def test_args(self):
+        filename = self._write(
+            '- output: a.txt\n'
+            '- output: b.csv\n'
+            '  args: -f csv --count "Name"\n'
+            '- output: c.csv\n'
+            '  args: [-f, csv, --role, owner]\n'
+        )
+        self.assertEqual(
+            [('a.txt', []),
+             ('b.csv', ['-f', 'csv', '--count', 'Name']),
+             ('c.csv', ['-f', 'csv', '--role', 'owner'])],
+            batch.load_spec(filename),
+        )
+
+    def test_not_a_list(self):
+        filename = self._write('output: a.txt\n')
+        self.assertRaises(ValueError, batch.load_spec, filename)
+
+    def test_no_output(self):
+        filename = self._write('- args: --count Name\n')
+        self.assertRaises(ValueError, batch.load_spec, filename)
+
+
+class TestBatchContributions(base.TestCase):
+
+    def _output(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def _read(self, name):
+        with open(self._output(name), 'r') as f:
+            return list(csv.reader(f))
+
+    def _run(self, *reports):
+        "Run a batch with the (output, args) reports and return the app."
+        data = os.path.join(self.tmpdir, 'data.csv')
+        with open(data, 'w') as f:
+            writer = csv.DictWriter(f, _COLUMNS)
+            writer.writeheader()
+            writer.writerows(_ROWS)
+        spec = os.path.join(self.tmpdir, 'spec.yaml')
+        with open(spec, 'w') as f:
+            for output, args in reports:
+                f.write('- output: {}\n  args: {}\n'.format(
+                    self._output(output), args))
+
+        app = main.WhoHelped()
+        app.stdout = io.StringIO()
+        app.command_manager.add_command('batch', batch.BatchContributions)
+        self.assertEqual(0, app.run(['batch', spec, data]))
+        return app
+
+    def test_reports(self):
+        app = self._run(
+            ('contributions.csv', '-f csv'),
+            ('people.csv', '-f csv --count Name'),
+            ('owners.csv', '-f csv --role owner --by Name'),
+        )
+
+        self.assertEqual(
+            [['Organization', 'Contributions'],
+             ['SUSE', '3'],
+             ['Red Hat', '2']],
+            self._read('contributions.csv'),
+        )
+        self.assertEqual(
+            [['Organization', 'Name'],
+             ['SUSE', '3'],
+             ['Red Hat', '1']],
+            self._read('people.csv'),
+        )
+        self.assertEqual(
+            [['Name', 'Contributions'],
+             ['A', '2'],
+             ['D', '1']],
+            self._read('owners.csv'),
+        )
+        self.assertEqual('', app.stdout.getvalue())
+
+    def test_column_and_sort_options(self):
+        app = self._run(
+            ('sorted.csv', '-f csv --sort-column Organization'),
+            ('counts.csv', '-f csv -c contributions'),
+        )
+        self.assertEqual(
+            [['Organization', 'Contributions'],
+             ['Red Hat', '2'],
+             ['SUSE', '3']],
+            self._read('sorted.csv'),
+        )
+        self.assertEqual(
+            [['Contributions'], ['3'], ['2']],
+            self._read('counts.csv'),
+        )
+        self.assertEqual('', app.stdout.getvalue())
+
+    def test_table(self):
+        self._run(('contributions.txt', ''))
+        with open(self._output('contributions.txt'), 'r') as f:
+            self.assertIn('| SUSE         |             3 |', f.read())
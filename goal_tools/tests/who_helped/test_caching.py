@@ -11,6 +11,8 @@
 # under the License.
 
 import os.path
+import shelve
+import weakref
 
 from goal_tools import caching
 from goal_tools.tests import base
@@ -21,6 +23,7 @@ class TestCaching(base.TestCase):
     def setUp(self):
         super().setUp()
         self.c = caching.Cache(os.path.join(self.tmpdir, 'cache.db'))
+        self.addCleanup(self.c.close)
 
     def test_contains(self):
         self.c[('a', 'b')] = 'cd'
@@ -39,3 +42,173 @@ class TestCaching(base.TestCase):
             self.c.__getitem__,
             ('a', 'b'),
         )
+
+    def test_del_item(self):
+        self.c[('a', 'b')] = 'cd'
+        del self.c[('a', 'b')]
+        self.assertNotIn(('a', 'b'), self.c)
+
+    def test_namespace(self):
+        self.c[('review', '12345')] = {'status': 'MERGED'}
+        self.assertIn(('review', '12345'), self.c)
+        self.assertNotIn(('member', '12345'), self.c)
+        self.assertEqual({'status': 'MERGED'}, self.c[('review', '12345')])
+
+    def test_persistent(self):
+        filename = os.path.join(self.tmpdir, 'persistent.db')
+        c = caching.Cache(filename)
+        c[('review', '12345')] = 'value'
+        c[('a', 'b')] = 'cd'
+        c.close()
+        c = caching.Cache(filename)
+        self.assertEqual('value', c[('review', '12345')])
+        self.assertEqual('cd', c[('a', 'b')])
+
+    def test_batch_flush(self):
+        filename = os.path.join(self.tmpdir, 'batch.db')
+        c = caching.Cache(filename, batch_size=2)
+        c[('review', '1')] = 'one'
+        reader = caching.Cache(filename)
+        self.assertNotIn(('review', '1'), reader)
+        c[('review', '2')] = 'two'
+        self.assertIn(('review', '1'), reader)
+        self.assertIn(('review', '2'), reader)
+
+
+class TestLegacyCache(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.filename = os.path.join(self.tmpdir, 'legacy.db')
+        with shelve.open(self.filename) as shelf:
+            shelf['review:12345'] = {'status': 'MERGED'}
+        self.c = caching.Cache(self.filename)
+        self.addCleanup(self.c.close)
+
+    def test_contains(self):
+        self.assertIn(('review', '12345'), self.c)
+
+    def test_get_item(self):
+        self.assertEqual({'status': 'MERGED'}, self.c[('review', '12345')])
+
+    def test_copy_on_read(self):
+        self.c[('review', '12345')]
+        self.c.flush()
+        self.assertEqual(
+            {'status': 'MERGED'},
+            self.c._select(('review', '12345')),
+        )
+
+    def test_del_item(self):
+        del self.c[('review', '12345')]
+        self.assertNotIn(('review', '12345'), self.c)
+
+
+class TestMemoryTier(base.TestCase):
+
+    def test_evict_entries(self):
+        m = caching.MemoryTier(max_entries=2)
+        m.put('a', 1, 1)
+        m.put('b', 2, 1)
+        m.put('c', 3, 1)
+        self.assertNotIn('a', m)
+        self.assertIn('b', m)
+        self.assertIn('c', m)
+        self.assertEqual(1, m.evictions)
+
+    def test_evict_bytes(self):
+        m = caching.MemoryTier(max_bytes=10)
+        m.put('a', 1, 6)
+        m.put('b', 2, 6)
+        self.assertNotIn('a', m)
+        self.assertIn('b', m)
+        self.assertEqual(6, m.stats['bytes'])
+
+    def test_promote_on_read(self):
+        m = caching.MemoryTier(max_entries=2)
+        m.put('a', 1, 1)
+        m.put('b', 2, 1)
+        self.assertEqual(1, m.get('a'))
+        m.put('c', 3, 1)
+        self.assertIn('a', m)
+        self.assertNotIn('b', m)
+
+    def test_counters(self):
+        m = caching.MemoryTier()
+        m.put('a', 1, 1)
+        m.get('a')
+        self.assertRaises(KeyError, m.get, 'b')
+        self.assertEqual(1, m.hits)
+        self.assertEqual(1, m.misses)
+
+
+class TestCacheMemoryTier(base.TestCase):
+
+    def test_read_from_disk_after_eviction(self):
+        c = caching.Cache(
+            os.path.join(self.tmpdir, 'cache.db'),
+            max_entries=1,
+        )
+        c[('review', '1')] = 'one'
+        c[('review', '2')] = 'two'
+        self.assertEqual('one', c[('review', '1')])
+        self.assertEqual(1, c.stats['entries'])
+        self.assertEqual(1, c.stats['misses'])
+        self.assertEqual(2, c.stats['evictions'])
+
+
+class _Memoized:
+
+    def __init__(self):
+        self.calls = 0
+
+    @caching.memoize()
+    def double(self, value):
+        self.calls += 1
+        return value * 2
+
+    @caching.memoize(maxsize=2)
+    def triple(self, value):
+        self.calls += 1
+        return value * 3
+
+
+class TestMemoize(base.TestCase):
+
+    def test_repeated_call(self):
+        m = _Memoized()
+        self.assertEqual(4, m.double(2))
+        self.assertEqual(4, m.double(2))
+        self.assertEqual(1, m.calls)
+
+    def test_per_instance(self):
+        a = _Memoized()
+        b = _Memoized()
+        a.double(2)
+        b.double(2)
+        self.assertEqual(1, a.calls)
+        self.assertEqual(1, b.calls)
+
+    def test_maxsize(self):
+        m = _Memoized()
+        for value in (1, 2, 3, 1):
+            m.triple(value)
+        self.assertEqual(4, m.calls)
+        self.assertEqual(2, caching.memo_stats(m)['triple']['entries'])
+
+    def test_stats(self):
+        m = _Memoized()
+        m.double(1)
+        m.double(1)
+        m.double(2)
+        stats = caching.memo_stats(m)
+        self.assertEqual(['double'], list(stats))
+        self.assertEqual(1, stats['double']['hits'])
+        self.assertEqual(2, stats['double']['misses'])
+
+    def test_instance_released(self):
+        m = _Memoized()
+        m.double(1)
+        ref = weakref.ref(m)
+        del m
+        self.assertIsNone(ref())
@@ -0,0 +1,95 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import datetime
+import os.path
+from unittest import mock
+
+from goal_tools import gerrit
+from goal_tools.tests import base
+from goal_tools.who_helped import changes
+
+_QUERY = 'status:merged'
+
+
+def _review(review_id, updated, project='openstack/nova'):
+    review = mock.Mock()
+    review.id = review_id
+    review.project = project
+    review.updated = updated
+    return review
+
+
+class TestQueryChangesIncremental(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.review_list = os.path.join(self.tmpdir, 'reviews.txt')
+        self.app = mock.Mock()
+        self.app.cache = {}
+        self.app.options.slim_cache = False
+        team_data = mock.Mock()
+        team_data.get_repo_owner.side_effect = lambda project: (
+            'Nova' if project == 'openstack/nova' else None)
+        patcher = mock.patch('goal_tools.governance.Governance',
+                             return_value=team_data)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, *reviews, incremental=True):
+        "Run the command and return the query string it used."
+        factory = mock.Mock()
+        factory.query.return_value = iter(reviews)
+        cmd = changes.QueryChanges(self.app, None)
+        args = [_QUERY, self.review_list]
+        if incremental:
+            args.insert(0, '--incremental')
+        parsed_args = cmd.get_parser('contributions changes').parse_args(
+            args)
+        with mock.patch('goal_tools.gerrit.ReviewFactory',
+                        return_value=factory):
+            cmd.take_action(parsed_args)
+        return factory.query.call_args[0][0]
+
+    def _ids(self):
+        return list(gerrit.parse_review_lists([self.review_list]))
+
+    def test_watermark_written(self):
+        updated = datetime.datetime(2018, 4, 26, 6, 34, 9)
+        self._run(
+            _review(1, updated - datetime.timedelta(days=1)),
+            _review(2, updated),
+            incremental=False,
+        )
+        self.assertEqual(updated, changes.read_watermark(self.review_list))
+        self.assertEqual(['1', '2'], self._ids())
+
+    def test_no_watermark(self):
+        with open(self.review_list, 'w', encoding='utf-8') as f:
+            f.write('# QUERY: {}\n1\n'.format(_QUERY))
+        self.assertIsNone(changes.read_watermark(self.review_list))
+
+    def test_second_run(self):
+        first = datetime.datetime(2018, 4, 26, 6, 34, 9)
+        self._run(_review(1, first), _review(2, first), incremental=False)
+        second = datetime.datetime(2018, 5, 1)
+        query = self._run(
+            _review(2, second),
+            _review(3, second - datetime.timedelta(hours=1)),
+            _review(4, second, project='openstack/unofficial'),
+        )
+        self.assertEqual(gerrit.add_after(_QUERY, first), query)
+        # The old and new IDs are merged without duplicates, and the
+        # unofficial project is still filtered out.
+        self.assertEqual(['1', '2', '3'], self._ids())
+        self.assertEqual(second, changes.read_watermark(self.review_list))
@@ -0,0 +1,158 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import csv
+import os.path
+
+from goal_tools import columnar
+from goal_tools.tests import base
+
+_COLUMNS = ['Review', 'Role', 'Organization']
+
+_ROWS = [
+    {'Review': '1', 'Role': 'owner', 'Organization': 'Red Hat'},
+    {'Review': '1', 'Role': 'reviewer', 'Organization': 'Huawei'},
+    {'Review': '2', 'Role': 'owner', 'Organization': 'Red Hat'},
+    {'Review': '3', 'Role': 'approver', 'Organization': 'SUSE'},
+]
+
+
+class TestColumnar(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.filename = os.path.join(self.tmpdir, 'data.col')
+
+    def _open(self):
+        table = columnar.Table(self.filename)
+        self.addCleanup(table.close)
+        return table
+
+    def test_round_trip(self):
+        columnar.write(self.filename, _COLUMNS, _ROWS)
+        table = self._open()
+        self.assertEqual(_COLUMNS, table.columns)
+        self.assertEqual(4, len(table))
+        self.assertEqual(_ROWS, list(table.rows()))
+
+    def test_dictionary_encoded(self):
+        columnar.write(self.filename, _COLUMNS, _ROWS)
+        table = self._open()
+        self.assertEqual(['Red Hat', 'Huawei', 'SUSE'],
+                         table.values('Organization'))
+        self.assertEqual([0, 1, 0, 2], list(table.codes('Organization')))
+        self.assertEqual(['Red Hat', 'Huawei', 'Red Hat', 'SUSE'],
+                         list(table.column('Organization')))
+
+    def test_wide_codes(self):
+        rows = [{'Review': str(i)} for i in range(300)]
+        columnar.write(self.filename, ['Review'], rows)
+        table = self._open()
+        self.assertEqual(2, table.codes('Review').itemsize)
+        self.assertEqual(rows, list(table.rows()))
+
+    def test_select(self):
+        columnar.write(self.filename, _COLUMNS, _ROWS)
+        table = self._open()
+        self.assertEqual([0, 2], table.select({'Role': 'owner'.__eq__}))
+        self.assertEqual(
+            [2],
+            table.select({'Role': 'owner'.__eq__,
+                          'Review': '2'.__eq__}),
+        )
+        self.assertEqual(range(4), table.select({}))
+
+    def test_rows_where(self):
+        columnar.write(self.filename, _COLUMNS, _ROWS)
+        table = self._open()
+        where = {'Organization': {'Huawei', 'SUSE'}.__contains__}
+        self.assertEqual([_ROWS[1], _ROWS[3]], list(table.rows(where)))
+
+    def test_empty(self):
+        columnar.write(self.filename, _COLUMNS, [])
+        table = self._open()
+        self.assertEqual(0, len(table))
+        self.assertEqual([], list(table.rows()))
+
+    def test_not_columnar(self):
+        with open(self.filename, 'w') as f:
+            f.write('Review,Role\n')
+        self.assertFalse(columnar.is_columnar(self.filename))
+        self.assertRaises(ValueError, columnar.Table, self.filename)
+
+
+class TestReadRows(base.TestCase):
+
+    def test_columnar(self):
+        filename = os.path.join(self.tmpdir, 'data.col')
+        columnar.write(filename, _COLUMNS, _ROWS)
+        self.assertEqual(_ROWS, list(columnar.read_rows(filename)))
+
+    def _write_csv(self):
+        filename = os.path.join(self.tmpdir, 'data.csv')
+        with open(filename, 'w', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, _COLUMNS)
+            writer.writeheader()
+            writer.writerows(_ROWS)
+        return filename
+
+    def test_csv(self):
+        filename = self._write_csv()
+        self.assertEqual(_ROWS, list(columnar.read_rows(filename)))
+
+    def test_columnar_where(self):
+        filename = os.path.join(self.tmpdir, 'data.col')
+        columnar.write(filename, _COLUMNS, _ROWS)
+        self.assertEqual(
+            [_ROWS[0], _ROWS[2]],
+            list(columnar.read_rows(filename, {'Role': 'owner'.__eq__})),
+        )
+
+    def test_csv_where(self):
+        filename = self._write_csv()
+        self.assertEqual(
+            [_ROWS[0], _ROWS[2]],
+            list(columnar.read_rows(filename, {'Role': 'owner'.__eq__})),
+        )
+
+
+class TestMakeRowTest(base.TestCase):
+
+    def test_one_column(self):
+        row_test = columnar.make_row_test({'Role': 'owner'.__eq__})
+        self.assertEqual(
+            [True, False, True, False],
+            [row_test(row) for row in _ROWS],
+        )
+
+    def test_several_columns(self):
+        row_test = columnar.make_row_test({
+            'Role': 'owner'.__eq__,
+            'Organization': 'Red Hat'.__eq__,
+            'Review': '1'.__eq__,
+        })
+        self.assertEqual(
+            [True, False, False, False],
+            [row_test(row) for row in _ROWS],
+        )
+
+    def test_values_tested_once(self):
+        seen = []
+
+        def test(value):
+            seen.append(value)
+            return True
+
+        row_test = columnar.make_row_test({'Organization': test})
+        for row in _ROWS:
+            row_test(row)
+        self.assertEqual(['Red Hat', 'Huawei', 'SUSE'], seen)
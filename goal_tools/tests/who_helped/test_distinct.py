@@ -35,3 +35,7 @@ class TestGetDistinct(base.TestCase):
             ('A', 'C'),
         ])
         self.assertEqual(expected, results)
+
+    def test_estimate(self):
+        results = distinct._estimate_distinct(['a', 'b'], self._data, 0.01)
+        self.assertEqual(2, results)
@@ -122,6 +122,30 @@ class TestFoundationMember(base.TestCase):
             a.organization,
         )
 
+    def test_find_affiliation_matches_scan(self):
+        def scan(when):
+            candidates = [
+                a for a in self.m.affiliations
+                if a.active(when)
+            ]
+            return candidates[-1].organization if candidates else None
+
+        day = datetime.datetime(2010, 1, 1)
+        while day < datetime.datetime(2019, 1, 1):
+            a = self.m.find_affiliation(day)
+            self.assertEqual(
+                scan(day),
+                a.organization if a else None,
+                day,
+            )
+            day += datetime.timedelta(days=7)
+
+    def test_find_affiliation_memo(self):
+        first = self.m.find_affiliation(datetime.datetime(2013, 11, 20))
+        second = self.m.find_affiliation(
+            datetime.datetime(2013, 11, 20, 23, 59))
+        self.assertIs(first, second)
+
 
 class TestFetchMember(base.TestCase):
 
@@ -146,3 +170,205 @@ class TestFetchMember(base.TestCase):
             results = self.f.fetch('doug@doughellmann.com')
         self.assertIn(('member', 'doug@doughellmann.com'), self.cache)
         self.assertEqual(_member_data, results._data)
+
+    def test_not_a_member_remembered(self):
+        with mock.patch('goal_tools.foundation.lookup_member') as f:
+            f.return_value = None
+            self.assertIsNone(self.f.fetch('nobody@example.com'))
+            self.assertIsNone(self.f.fetch_many(
+                ['nobody@example.com'])['nobody@example.com'])
+        f.assert_called_once_with('nobody@example.com')
+
+
+class TestFetchManyMembers(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = {}
+        self.f = foundation.MemberFactory(self.cache)
+
+    def test_batches(self):
+        emails = ['person{}@example.com'.format(i) for i in range(5)]
+        with mock.patch('goal_tools.foundation.lookup_members') as f:
+            f.return_value = {}
+            results = self.f.fetch_many(emails, batch_size=2)
+        self.assertEqual(3, f.call_count)
+        self.assertEqual(
+            sorted(emails),
+            sorted(e for call in f.call_args_list for e in call[0][0]),
+        )
+        self.assertEqual(dict.fromkeys(emails), results)
+
+    def test_mixed(self):
+        self.cache[('member', 'doug@doughellmann.com')] = _member_data
+        with mock.patch('goal_tools.foundation.lookup_members') as f:
+            f.return_value = {'other@example.com': _member_data}
+            results = self.f.fetch_many([
+                'doug@doughellmann.com',
+                'other@example.com',
+                'nobody@example.com',
+                'other@example.com',
+            ])
+        self.assertEqual(1, f.call_count)
+        self.assertEqual(
+            ['nobody@example.com', 'other@example.com'],
+            sorted(f.call_args[0][0]),
+        )
+        self.assertEqual(_member_data,
+                         results['doug@doughellmann.com']._data)
+        self.assertEqual(_member_data, results['other@example.com']._data)
+        self.assertIsNone(results['nobody@example.com'])
+        self.assertIn(('member', 'other@example.com'), self.cache)
+        self.assertTrue(foundation.is_miss_entry(
+            self.cache[('member', 'nobody@example.com')]))
+
+    def test_fetch_after_fetch_many(self):
+        with mock.patch('goal_tools.foundation.lookup_members') as f:
+            f.return_value = {}
+            self.f.fetch_many(['nobody@example.com'])
+        with mock.patch('goal_tools.foundation.lookup_member') as f:
+            f.side_effect = AssertionError('should not be called')
+            self.assertIsNone(self.f.fetch('nobody@example.com'))
+
+
+class TestLookupMembers(base.TestCase):
+
+    # The records returned by the API do not include the addresses,
+    # so fake a directory keyed by address and answer each query with
+    # the records for the addresses in its filter.
+    _members = {
+        'doug@doughellmann.com': _member_data,
+    }
+
+    def _lookup(self, emails, members=None):
+        members = self._members if members is None else members
+        queries = []
+
+        def requester(url, params, headers):
+            queried = [
+                e[len('email=='):]
+                for e in params['filter[]'][1].split(',')
+            ]
+            queries.append(queried)
+            return [members[e] for e in queried if e in members]
+
+        with mock.patch('goal_tools.apis.requester') as req, \
+                mock.patch('goal_tools.apis.decode_json') as decode:
+            req.side_effect = requester
+            decode.side_effect = lambda records: {
+                'data': records, 'last_page': 1,
+            }
+            found = foundation.lookup_members(emails)
+        return found, queries
+
+    def test_no_members(self):
+        emails = ['a{}@example.com'.format(i) for i in range(50)]
+        found, queries = self._lookup(emails)
+        self.assertEqual({}, found)
+        self.assertEqual(1, len(queries))
+
+    def test_one_member_in_batch(self):
+        emails = ['a{}@example.com'.format(i) for i in range(49)]
+        emails.insert(17, 'doug@doughellmann.com')
+        found, queries = self._lookup(emails)
+        self.assertEqual({'doug@doughellmann.com': _member_data}, found)
+        # The batch is split in half until the member is found, rather
+        # than looking up each address on its own.
+        self.assertLess(len(queries), 15)
+
+    def test_several_members(self):
+        other = copy.deepcopy(_member_data)
+        other['id'] = 1
+        members = {'a@example.com': other,
+                   'doug@doughellmann.com': _member_data}
+        emails = ['a@example.com', 'b@example.com', 'c@example.com',
+                  'doug@doughellmann.com']
+        found, queries = self._lookup(emails, members)
+        self.assertEqual(members, found)
+
+    def test_mostly_members(self):
+        emails = ['a{}@example.com'.format(i) for i in range(50)]
+        members = {}
+        for i, email in enumerate(emails):
+            if i % 5:
+                member = copy.deepcopy(_member_data)
+                member['id'] = i
+                members[email] = member
+        found, queries = self._lookup(emails, members)
+        self.assertEqual(members, found)
+        # Splitting the batch would cost more than one request per
+        # address, so each address is looked up on its own instead.
+        self.assertLessEqual(len(queries), len(emails))
+
+    def test_all_members(self):
+        emails = ['a{}@example.com'.format(i) for i in range(10)]
+        members = {}
+        for i, email in enumerate(emails):
+            member = copy.deepcopy(_member_data)
+            member['id'] = i
+            members[email] = member
+        found, queries = self._lookup(emails, members)
+        self.assertEqual(members, found)
+        self.assertLessEqual(len(queries), len(emails))
+
+    def test_pages(self):
+        pages = [
+            {'data': [_member_data], 'last_page': 2},
+            {'data': [], 'last_page': 2},
+        ]
+        with mock.patch('goal_tools.apis.requester'), \
+                mock.patch('goal_tools.apis.decode_json') as decode:
+            decode.side_effect = pages
+            found = foundation.lookup_members(['doug@doughellmann.com'])
+        self.assertEqual({'doug@doughellmann.com': _member_data}, found)
+        self.assertEqual(2, decode.call_count)
+
+
+class TestMemberMissCache(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = {}
+        self.f = foundation.MemberFactory(
+            self.cache, miss_ttl=datetime.timedelta(days=1))
+
+    def test_miss_stored(self):
+        with mock.patch('goal_tools.foundation.lookup_member') as f:
+            f.return_value = None
+            self.assertIsNone(self.f.fetch('nobody@example.com'))
+        entry = self.cache[('member', 'nobody@example.com')]
+        self.assertTrue(foundation.is_miss_entry(entry))
+
+    def test_fresh_miss_used(self):
+        self.cache[('member', 'nobody@example.com')] = (
+            foundation.make_miss_entry()
+        )
+        with mock.patch('goal_tools.foundation.lookup_member') as f:
+            f.side_effect = AssertionError('should not be called')
+            self.assertIsNone(self.f.fetch('nobody@example.com'))
+        with mock.patch('goal_tools.foundation.lookup_members') as f:
+            f.side_effect = AssertionError('should not be called')
+            results = self.f.fetch_many(['nobody@example.com'])
+        self.assertEqual({'nobody@example.com': None}, results)
+
+    def test_expired_miss_rechecked(self):
+        old = datetime.datetime.utcnow() - datetime.timedelta(days=2)
+        self.cache[('member', 'doug@doughellmann.com')] = (
+            foundation.make_miss_entry(old)
+        )
+        with mock.patch('goal_tools.foundation.lookup_members') as f:
+            f.return_value = {'doug@doughellmann.com': _member_data}
+            results = self.f.fetch_many(['doug@doughellmann.com'])
+        self.assertEqual(_member_data,
+                         results['doug@doughellmann.com']._data)
+        self.assertEqual(_member_data,
+                         self.cache[('member', 'doug@doughellmann.com')])
+
+    def test_miss_entry_age(self):
+        now = datetime.datetime(2018, 5, 2)
+        entry = foundation.make_miss_entry(datetime.datetime(2018, 5, 1))
+        self.assertEqual(datetime.timedelta(days=1),
+                         foundation.miss_entry_age(entry, now))
+
+    def test_member_data_is_not_miss(self):
+        self.assertFalse(foundation.is_miss_entry(_member_data))
@@ -17,6 +17,8 @@ import pkgutil
 import textwrap
 from unittest import mock
 
+import requests_mock
+
 from goal_tools import gerrit
 from goal_tools.tests import base
 
@@ -103,6 +105,12 @@ class TestReview(base.TestCase):
             self.rev.created,
         )
 
+    def test_updated(self):
+        self.assertEqual(
+            datetime.datetime(2018, 4, 26, 6, 32, 1),
+            self.rev.updated,
+        )
+
     def test_is_merged(self):
         self.assertFalse(self.rev.is_merged)
         self.assertTrue(self.rev2.is_merged)
@@ -186,6 +194,20 @@ class TestReview(base.TestCase):
         self.assertEqual(expected, uploaders)
 
 
+class TestAddAfter(base.TestCase):
+
+    def test_no_watermark(self):
+        self.assertEqual('status:merged',
+                         gerrit.add_after('status:merged', None))
+
+    def test_watermark(self):
+        self.assertEqual(
+            '(status:merged) after:"2018-04-26 06:34:09 +0000"',
+            gerrit.add_after('status:merged',
+                             datetime.datetime(2018, 4, 26, 6, 34, 9)),
+        )
+
+
 class TestFetchReview(base.TestCase):
 
     def setUp(self):
@@ -197,7 +219,7 @@ class TestFetchReview(base.TestCase):
         with mock.patch('goal_tools.gerrit.query_gerrit') as f:
             f.return_value = _data_55535
             results = self.f.fetch('55535')
-        self.assertNotIn(('review', '55535'), self.cache)
+        self.assertTrue(gerrit.is_open_entry(self.cache[('review', '55535')]))
         self.assertEqual(_data_55535, results._data)
 
     def test_not_in_cache_merged(self):
@@ -215,3 +237,297 @@ class TestFetchReview(base.TestCase):
             results = self.f.fetch('561507')
         self.assertIn(('review', '561507'), self.cache)
         self.assertEqual(_data_561507, results._data)
+
+    def test_not_in_cache_merged_slim(self):
+        f = gerrit.ReviewFactory(self.cache, slim=True)
+        with mock.patch('goal_tools.gerrit.query_gerrit') as q:
+            q.return_value = _data_561507
+            f.fetch('561507')
+        self.assertTrue(gerrit.is_packed(self.cache[('review', '561507')]))
+
+    def test_in_cache_slim(self):
+        self.cache[('review', '561507')] = gerrit.pack_change(_data_561507)
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = AssertionError('should not be called')
+            results = self.f.fetch('561507')
+        self.assertEqual(
+            list(gerrit.Review('561507', _data_561507).participants),
+            list(results.participants),
+        )
+
+    def test_in_cache_slim_old_schema(self):
+        packed = gerrit.pack_change(_data_561507)
+        packed['_slim_schema'] = gerrit.SLIM_SCHEMA_VERSION - 1
+        self.cache[('review', '561507')] = packed
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.return_value = _data_561507
+            results = self.f.fetch('561507')
+        self.assertEqual(_data_561507, results._data)
+
+
+class TestRevalidateReview(base.TestCase):
+
+    _url = 'https://review.openstack.org/changes/55535'
+
+    def setUp(self):
+        super().setUp()
+        self.cache = {}
+        self.f = gerrit.ReviewFactory(self.cache)
+        gerrit.cache_review('55535', _data_55535, self.cache, etag='"abc"')
+
+    def test_not_modified(self):
+        with requests_mock.Mocker() as m:
+            m.get(self._url, status_code=304, headers={'ETag': '"abc"'})
+            with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+                f.side_effect = AssertionError('should not be called')
+                results = self.f.fetch('55535')
+        self.assertEqual('"abc"', m.last_request.headers['If-None-Match'])
+        self.assertEqual(_data_55535, results._data)
+
+    def test_same_updated(self):
+        summary = {'updated': _data_55535['updated']}
+        with requests_mock.Mocker() as m:
+            m.get(self._url, text=json.dumps(summary),
+                  headers={'ETag': '"def"'})
+            with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+                f.side_effect = AssertionError('should not be called')
+                results = self.f.fetch('55535')
+        self.assertEqual(_data_55535, results._data)
+        entry = self.cache[('review', '55535')]
+        self.assertEqual('"def"', entry['_revalidate']['etag'])
+
+    def test_changed(self):
+        new_data = dict(_data_55535, updated='2018-05-01 00:00:00.000000000')
+        summary = {'updated': new_data['updated']}
+        with requests_mock.Mocker() as m:
+            m.get(self._url, text=json.dumps(summary))
+            with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+                f.return_value = new_data
+                results = self.f.fetch('55535')
+        self.assertEqual(new_data, results._data)
+        entry = self.cache[('review', '55535')]
+        self.assertEqual(new_data['updated'], entry['_revalidate']['updated'])
+
+
+class TestFetchManyReviews(base.TestCase):
+
+    _data = {
+        '55535': _data_55535,
+        '561507': _data_561507,
+        '566433': _data_566433,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.cache = {}
+        self.f = gerrit.ReviewFactory(self.cache)
+
+    def _query(self, method, params={}):
+        return self._data[method.split('/')[1]]
+
+    def test_order(self):
+        ids = ['566433', '55535', '561507']
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = self._query
+            results = list(self.f.fetch_many(ids, workers=2))
+        self.assertEqual(ids, [r.id for r in results])
+        for r in results:
+            self.assertEqual(self._data[r.id], r._data)
+
+    def test_cached(self):
+        self.cache[('review', '561507')] = _data_561507
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = self._query
+            results = list(self.f.fetch_many(['55535', '561507'], workers=2))
+        self.assertEqual(['55535', '561507'], [r.id for r in results])
+        f.assert_called_once_with(
+            'changes/55535/detail',
+            params={'o': gerrit.QUERY_OPTIONS},
+        )
+
+    def test_adds_to_cache(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = self._query
+            list(self.f.fetch_many(['55535', '561507'], workers=2))
+        self.assertTrue(gerrit.is_open_entry(self.cache[('review', '55535')]))
+        self.assertEqual(_data_561507, self.cache[('review', '561507')])
+
+    def test_error(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = RuntimeError('failed')
+            results = self.f.fetch_many(['55535'], workers=2)
+            self.assertRaises(RuntimeError, list, results)
+
+    def test_serial(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = self._query
+            results = list(self.f.fetch_many(['55535', '561507'], workers=1))
+        self.assertEqual(['55535', '561507'], [r.id for r in results])
+
+
+class TestPrefetchReviews(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = {}
+        self.f = gerrit.ReviewFactory(self.cache)
+
+    def test_batches(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = [[_data_561507], [_data_55535]]
+            self.f.prefetch(['561507', '555353'], batch_size=1)
+        queries = [c[1]['params']['q'] for c in f.call_args_list]
+        self.assertEqual(['change:561507', 'change:555353'], queries)
+        self.assertIn(('review', '561507'), self.cache)
+
+    def test_one_query(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.return_value = [_data_561507, _data_55535]
+            self.f.prefetch(['561507', '555353'])
+        f.assert_called_once()
+        self.assertEqual(
+            'change:561507 OR change:555353',
+            f.call_args[1]['params']['q'],
+        )
+
+    def test_skips_cached(self):
+        self.cache[('review', '561507')] = _data_561507
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.return_value = [_data_55535]
+            self.f.prefetch(['561507', '555353'])
+        self.assertEqual('change:555353', f.call_args[1]['params']['q'])
+
+    def test_skips_cached_without_loading(self):
+        gerrit.cache_review('561507', _data_561507, self.cache)
+        gerrit.cache_review('55535', _data_55535, self.cache)
+        loaded = []
+
+        class Cache(dict):
+            def __getitem__(self, key):
+                loaded.append(key)
+                return super().__getitem__(key)
+
+        f = gerrit.ReviewFactory(Cache(self.cache))
+        with mock.patch('goal_tools.gerrit.query_gerrit') as q:
+            q.return_value = [_data_55535]
+            f.prefetch(['561507', '55535'])
+        # The unmerged review is asked for again.
+        self.assertEqual('change:55535', q.call_args[1]['params']['q'])
+        self.assertEqual([], loaded)
+
+    def test_open_marker_removed_when_merged(self):
+        merged = dict(_data_55535, status='MERGED')
+        gerrit.cache_review('55535', _data_55535, self.cache)
+        self.assertTrue(gerrit.is_open_cached('55535', self.cache))
+        gerrit.cache_review('55535', merged, self.cache)
+        self.assertFalse(gerrit.is_open_cached('55535', self.cache))
+
+    def test_fetch_uses_prefetched(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.return_value = [_data_55535]
+            self.f.prefetch(['555353'])
+            f.side_effect = AssertionError('should not be called')
+            results = self.f.fetch('555353')
+        self.assertEqual(_data_55535, results._data)
+        self.assertTrue(
+            gerrit.is_open_entry(self.cache[('review', '555353')]))
+
+
+class TestQueryReviews(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = {}
+        self.f = gerrit.ReviewFactory(self.cache)
+        self.changes = [
+            {'_number': n, 'status': 'NEW'}
+            for n in range(1, 8)
+        ]
+
+    def _query(self, method, params={}):
+        start = params['start']
+        n = int(params['n'])
+        page = [dict(c) for c in self.changes[start:start + n]]
+        if page and start + n < len(self.changes):
+            page[-1]['_more_changes'] = True
+        return page
+
+    def test_sequential(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = self._query
+            results = list(self.f.query('q', page_size=3))
+        self.assertEqual(list(range(1, 8)), [r.id for r in results])
+        self.assertEqual(3, f.call_count)
+
+    def test_lookahead(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.side_effect = self._query
+            results = list(self.f.query('q', page_size=3, lookahead=2))
+        self.assertEqual(list(range(1, 8)), [r.id for r in results])
+        offsets = sorted(c[1]['params']['start'] for c in f.call_args_list)
+        self.assertEqual([0, 3, 6], offsets[:3])
+
+    def test_stream(self):
+        def stream(method, params={}, headers={}, stream=False):
+            self.assertTrue(stream)
+            r = mock.Mock()
+            r.encoding = 'utf-8'
+            body = ")]}'\n" + json.dumps(self._query(method, params))
+            r.iter_content.return_value = [body.encode('utf-8')]
+            return r
+
+        with mock.patch('goal_tools.gerrit._request_gerrit') as f:
+            f.side_effect = stream
+            results = list(self.f.query('q', page_size=3, stream=True))
+        self.assertEqual(list(range(1, 8)), [r.id for r in results])
+        self.assertEqual(3, f.call_count)
+
+    def test_lookahead_empty(self):
+        with mock.patch('goal_tools.gerrit.query_gerrit') as f:
+            f.return_value = []
+            results = list(self.f.query('q', lookahead=2))
+        self.assertEqual([], results)
+
+
+class TestSlimChange(base.TestCase):
+
+    def _check_same(self, review_id, data):
+        full = gerrit.Review(review_id, data)
+        slim = gerrit.Review(
+            review_id,
+            gerrit.unpack_change(gerrit.pack_change(data)),
+        )
+        self.assertEqual(list(full.participants), list(slim.participants))
+        self.assertEqual(list(full.plus_ones), list(slim.plus_ones))
+        self.assertEqual(full.project, slim.project)
+        self.assertEqual(full.branch, slim.branch)
+        self.assertEqual(full.is_merged, slim.is_merged)
+
+    def test_participants_55535(self):
+        self._check_same('55535', _data_55535)
+
+    def test_participants_561507(self):
+        self._check_same('561507', _data_561507)
+
+    def test_participants_566433(self):
+        self._check_same('566433', _data_566433)
+
+    def test_drops_unused_fields(self):
+        slim = gerrit.slim_change(_data_561507)
+        self.assertNotIn('reviewer_updates', slim)
+        self.assertNotIn('Verified', slim['labels'])
+
+
+class TestToDatetime(base.TestCase):
+
+    def test_none(self):
+        self.assertIsNone(gerrit._to_datetime(None))
+
+    def test_gerrit_format(self):
+        self.assertEqual(
+            datetime.datetime(2018, 4, 24, 10, 18, 51),
+            gerrit._to_datetime('2018-04-24 10:18:51.000000000'),
+        )
+
+    def test_other_format(self):
+        self.assertRaises(ValueError, gerrit._to_datetime, '24/04/2018')
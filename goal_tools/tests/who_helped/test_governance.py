@@ -12,11 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import fixtures
+import requests_mock
+
 from goal_tools.tests import base
 
 from goal_tools import governance
-
-import yaml
+from goal_tools import yamlutils
 
 
 _team_data_yaml = """
@@ -80,9 +82,9 @@ operations-docs:
 """
 
 TEAM_DATA = governance.Governance._organize_team_data(
-    yaml.load(_team_data_yaml),
+    yamlutils.load(_team_data_yaml),
     {'Technical Committee': [{'repo': 'openstack/governance'}]},
-    yaml.load(_sigs_data_yaml),
+    yamlutils.load(_sigs_data_yaml),
 )
 
 
@@ -115,3 +117,79 @@ class TestGovernance(base.TestCase):
             set(),
             self.gov.get_repo_tags('openstack/no-such-repo'),
         )
+
+    def test_get_tagged_repos(self):
+        self.assertEqual(
+            set(['openstack/release-test']),
+            self.gov.get_tagged_repos('asserts:stable-policy'),
+        )
+
+    def test_get_tagged_repos_no_such_tag(self):
+        self.assertEqual(set(), self.gov.get_tagged_repos('no-such-tag'))
+
+
+class TestGovernanceCache(base.TestCase):
+
+    _tc_yaml = """
+Technical Committee:
+  - repo: openstack/governance
+"""
+
+    def setUp(self):
+        super().setUp()
+        self.useFixture(fixtures.MonkeyPatch(
+            'goal_tools.governance._loaded', {}))
+        self.m = requests_mock.Mocker()
+        self.m.start()
+        self.addCleanup(self.m.stop)
+        self.m.get(governance.PROJECTS_LIST, text=_team_data_yaml,
+                   headers={'ETag': '"projects"'})
+        self.m.get(governance.TC_LIST, text=self._tc_yaml,
+                   headers={'ETag': '"tc"'})
+        self.m.get(governance.SIGS_LIST, text=_sigs_data_yaml,
+                   headers={'Last-Modified': 'Mon, 01 Oct 2018 00:00:00 GMT'})
+
+    def _load(self):
+        return governance.Governance(cache_dir=self.tmpdir)
+
+    def test_shared_in_process(self):
+        first = self._load()
+        second = self._load()
+        self.assertIs(first._team_data, second._team_data)
+        self.assertEqual(3, self.m.call_count)
+
+    def test_saved_data_revalidated(self):
+        self._load()
+        governance._loaded.clear()
+        for url in (governance.PROJECTS_LIST, governance.TC_LIST,
+                    governance.SIGS_LIST):
+            self.m.get(url, status_code=304)
+        gov = self._load()
+        self.assertEqual('Release Management',
+                         gov.get_repo_owner('openstack/releases'))
+        headers = [r.headers for r in self.m.request_history[3:]]
+        self.assertEqual('"projects"', headers[0]['If-None-Match'])
+        self.assertEqual('"tc"', headers[1]['If-None-Match'])
+        self.assertEqual('Mon, 01 Oct 2018 00:00:00 GMT',
+                         headers[2]['If-Modified-Since'])
+
+    def test_changed_source_reorganized(self):
+        self._load()
+        governance._loaded.clear()
+        self.m.get(governance.PROJECTS_LIST, status_code=304)
+        self.m.get(governance.TC_LIST, text="""
+Technical Committee:
+  - repo: openstack/new-tc-repo
+""")
+        self.m.get(governance.SIGS_LIST, status_code=304)
+        gov = self._load()
+        self.assertEqual('Technical Committee',
+                         gov.get_repo_owner('openstack/new-tc-repo'))
+        self.assertIsNone(gov.get_repo_owner('openstack/governance'))
+        self.assertEqual('Release Management',
+                         gov.get_repo_owner('openstack/releases'))
+
+    def test_no_cache_dir(self):
+        gov = governance.Governance(cache_dir=None)
+        self.assertEqual('Release Management',
+                         gov.get_repo_owner('openstack/releases'))
@@ -0,0 +1,79 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from goal_tools import groupby
+from goal_tools.tests import base
+
+
+class TestEncode(base.TestCase):
+
+    def test_encode(self):
+        rows = [
+            {'a': 'A', 'b': 'B'},
+            {'a': 'C', 'b': 'B'},
+            {'a': 'A', 'b': 'D'},
+        ]
+        (a_values, a_codes), (b_values, b_codes) = groupby.encode(
+            rows, ['a', 'b'])
+        self.assertEqual(['A', 'C'], a_values)
+        self.assertEqual([0, 1, 0], list(a_codes))
+        self.assertEqual(['B', 'D'], b_values)
+        self.assertEqual([0, 0, 1], list(b_codes))
+
+    def test_encoder_add(self):
+        encoder = groupby.Encoder(['a'])
+        encoder.add({'a': 'A', 'b': 'B'})
+        encoder.add({'a': 'C', 'b': 'B'})
+        (a_values, a_codes), = encoder.columns()
+        self.assertEqual(['A', 'C'], a_values)
+        self.assertEqual([0, 1], list(a_codes))
+        encoder.add({'a': 'A', 'b': 'D'})
+        (a_values, a_codes), = encoder.columns()
+        self.assertEqual([0, 1, 0], list(a_codes))
+
+    def test_encoder_extend(self):
+        encoder = groupby.Encoder(['a'])
+        encoder.add({'a': 'A'})
+        encoder.extend({'a': (['C', 'A'], [0, 1, 0]), 'b': ([], [])})
+        (a_values, a_codes), = encoder.columns()
+        self.assertEqual(['A', 'C'], a_values)
+        self.assertEqual([0, 1, 0, 1], list(a_codes))
+
+
+class TestCount(base.TestCase):
+
+    def test_count_one_column(self):
+        self.assertEqual({0: 2, 1: 1}, groupby.count([[0, 1, 0]]))
+
+    def test_count_two_columns(self):
+        self.assertEqual(
+            {(0, 0): 2, (1, 0): 1},
+            groupby.count([[0, 1, 0], [0, 0, 0]]),
+        )
+
+    def test_count_distinct(self):
+        self.assertEqual(
+            {0: 2, 1: 1},
+            groupby.count([[0, 1, 0, 0]], [[5, 5, 6, 5]]),
+        )
+
+    def test_count_distinct_two_columns(self):
+        self.assertEqual(
+            {0: 3},
+            groupby.count([[0, 0, 0, 0]], [[1, 1, 2, 2], [1, 1, 1, 2]]),
+        )
+
+    def test_decode(self):
+        self.assertEqual(
+            {('A', 'B'): 2, ('C', 'B'): 1},
+            groupby.decode({(0, 0): 2, (1, 0): 1}, [['A', 'C'], ['B']]),
+        )
@@ -0,0 +1,86 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import sys
+
+from goal_tools import hyperloglog
+from goal_tools.tests import base
+
+
+def _sketch(values, error_rate=0.02):
+    sketch = hyperloglog.HyperLogLog(error_rate)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+class TestPrecision(base.TestCase):
+
+    def test_error_rate(self):
+        # 1.04 / sqrt(2 ** 14) is just under 0.01
+        self.assertEqual(14, hyperloglog.precision_for(0.01))
+
+    def test_limits(self):
+        self.assertEqual(4, hyperloglog.precision_for(0.9))
+        self.assertEqual(16, hyperloglog.precision_for(0.0001))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, hyperloglog.precision_for, 0)
+        self.assertRaises(ValueError, hyperloglog.precision_for, 1.5)
+
+
+class TestHyperLogLog(base.TestCase):
+
+    def test_small_sets_are_exact(self):
+        sketch = _sketch(['a', 'b', 'a', 'c'])
+        self.assertEqual(3, len(sketch))
+
+    def test_hashes_smaller_than_registers(self):
+        sketch = hyperloglog.HyperLogLog(0.01)
+        largest = 0
+        i = 0
+        while sketch._registers is None:
+            largest = max(largest, sys.getsizeof(sketch._hashes) + sum(
+                sys.getsizeof(h) for h in sketch._hashes))
+            sketch.add('value {}'.format(i))
+            i += 1
+        self.assertLess(largest, len(sketch._registers))
+
+    def test_estimate(self):
+        sketch = _sketch('value {}'.format(i % 20000) for i in range(40000))
+        # Allow three times the standard error.
+        self.assertLess(abs(len(sketch) - 20000), 20000 * 0.06)
+
+    def test_merge(self):
+        first = _sketch('value {}'.format(i) for i in range(15000))
+        second = _sketch('value {}'.format(i) for i in range(10000, 25000))
+        first.merge(second)
+        self.assertLess(abs(len(first) - 25000), 25000 * 0.06)
+
+    def test_merge_matches_single_sketch(self):
+        values = ['value {}'.format(i) for i in range(5000)]
+        whole = _sketch(values)
+        first = _sketch(values[:100])
+        first.merge(_sketch(values[100:]))
+        self.assertEqual(len(whole), len(first))
+
+    def test_merge_small_sketches(self):
+        first = _sketch(['a', 'b'])
+        first.merge(_sketch(['b', 'c']))
+        self.assertEqual(3, len(first))
+
+    def test_merge_different_precision(self):
+        self.assertRaises(
+            ValueError,
+            _sketch(['a'], 0.01).merge,
+            _sketch(['a'], 0.1),
+        )
@@ -0,0 +1,40 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import io
+import os.path
+
+from cliff import command
+
+from goal_tools.tests import base
+from goal_tools.who_helped import main
+
+
+class _StoreValue(command.Command):
+    "Write a value to the cache."
+
+    def take_action(self, parsed_args):
+        self.app.cache[('misc', 'key')] = 'value'
+
+
+class TestCleanUp(base.TestCase):
+
+    def test_cache_reopened_after_command(self):
+        app = main.WhoHelped()
+        app.stdout = io.StringIO()
+        app.command_manager.add_command('store', _StoreValue)
+        cache_file = os.path.join(self.tmpdir, 'cache.db')
+        self.assertEqual(0, app.run(['--cache-file', cache_file, 'store']))
+        # The next command in interactive mode gets a usable cache.
+        self.assertNotIn(('misc', 'other'), app.cache)
+        self.assertEqual('value', app.cache[('misc', 'key')])
+        app.cache.close()
@@ -25,6 +25,12 @@ class TestOrganizations(base.TestCase):
              'company_name': 'Red Hat'},
             {'domains': ['doughellmann.com', 'pymotw.com'],
              'company_name': 'PyMOTW'},
+            {'domains': ['example.com'],
+             'company_name': 'Example'},
+            {'domains': ['Research.Example.com'],
+             'company_name': 'Example Research'},
+            {'domains': ['ac.th', 'sut.ac.th'],
+             'company_name': 'Suranaree University of Technology'},
         ])
 
     def test_with_alias(self):
@@ -61,3 +67,63 @@ class TestOrganizations(base.TestCase):
             'Automation',
             self.o.from_email('infra-root@openstack.org')
         )
+
+    def test_from_email_subdomain(self):
+        self.assertEqual(
+            'PyMOTW',
+            self.o.from_email('doug@mail.doughellmann.com')
+        )
+
+    def test_from_email_closest_domain(self):
+        self.assertEqual(
+            'Example Research',
+            self.o.from_email('someone@lab.research.example.com')
+        )
+        self.assertEqual(
+            'Example',
+            self.o.from_email('someone@other.example.com')
+        )
+
+    def test_from_email_case_insensitive(self):
+        self.assertEqual(
+            'PyMOTW',
+            self.o.from_email('doug@DougHellmann.COM')
+        )
+
+    def test_from_email_suffix_only(self):
+        self.assertIsNone(
+            self.o.from_email('someone@com')
+        )
+        self.assertIsNone(
+            self.o.from_email('someone@notexample.com')
+        )
+
+    def test_from_email_public_suffix(self):
+        # Other universities are not credited to the organization
+        # listing the shared academic domain.
+        for email in ['a@cs.chula.ac.th', 'a@mahidol.ac.th',
+                      'a@student.ku.ac.th']:
+            self.assertIsNone(self.o.from_email(email))
+        self.assertEqual(
+            'Suranaree University of Technology',
+            self.o.from_email('a@ac.th'),
+        )
+        self.assertEqual(
+            'Suranaree University of Technology',
+            self.o.from_email('a@eng.sut.ac.th'),
+        )
+
+    def test_packaged_data_public_suffix(self):
+        o = organizations.Organizations()
+        self.assertIsNone(o.from_email('a@mahidol.ac.th'))
+
+    def test_resolve_many(self):
+        self.assertEqual(
+            ['PyMOTW', None, 'Automation', 'PyMOTW'],
+            self.o.resolve_many([
+                'doug@doughellmann.com',
+                'dhellmann@redhat.com',
+                'infra-root@openstack.org',
+                'doug@doughellmann.com',
+            ])
+        )
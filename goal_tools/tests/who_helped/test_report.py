@@ -0,0 +1,167 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import csv
+import os.path
+import sqlite3
+from unittest import mock
+
+from goal_tools import columnar
+from goal_tools.tests import base
+from goal_tools.who_helped import sql
+from goal_tools.who_helped import summarize
+
+_COLUMNS = ['Review', 'Project', 'Team', 'Role', 'Organization']
+
+_ROWS = [
+    {'Review': '1', 'Project': 'openstack/nova', 'Team': 'Nova',
+     'Role': 'owner', 'Organization': 'Red Hat'},
+    {'Review': '1', 'Project': 'openstack/nova', 'Team': 'Nova',
+     'Role': 'reviewer', 'Organization': 'Huawei'},
+    {'Review': '2', 'Project': 'openstack/vendor', 'Team': 'Vendor',
+     'Role': 'owner', 'Organization': 'Vendor Inc'},
+    {'Review': '3', 'Project': 'openstack/other', 'Team': 'Other',
+     'Role': 'owner', 'Organization': 'SUSE'},
+]
+
+_TAGS = {
+    'openstack/nova': set(['team:diverse-affiliation']),
+    'openstack/vendor': set(['team:single-vendor']),
+}
+
+
+class TestFilters(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cmd = summarize.SummarizeContributions(mock.Mock(), None)
+        team_data = mock.Mock()
+        team_data.get_tagged_repos.side_effect = lambda tag: set(
+            repo for repo, tags in _TAGS.items() if tag in tags
+        )
+        patcher = mock.patch('goal_tools.governance.Governance',
+                             return_value=team_data)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.csv_file = os.path.join(self.tmpdir, 'data.csv')
+        with open(self.csv_file, 'w', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, _COLUMNS)
+            writer.writeheader()
+            writer.writerows(_ROWS)
+        self.col_file = os.path.join(self.tmpdir, 'data.col')
+        columnar.write(self.col_file, _COLUMNS, _ROWS)
+
+    def _reviews(self, *args):
+        "Return the reviews reported from each input file format."
+        results = []
+        for filename in (self.csv_file, self.col_file):
+            parsed_args = self.cmd.get_parser('summarize').parse_args(
+                list(args) + [filename])
+            results.append(
+                [row['Review']
+                 for row in self.cmd.get_contributions(parsed_args)])
+            row_filter = self.cmd.get_row_filter(parsed_args)
+            self.assertEqual(
+                results[-1],
+                [row['Review']
+                 for row in map(row_filter, _ROWS)
+                 if row is not None],
+            )
+        self.assertEqual(results[0], results[1])
+        return results[0]
+
+    def test_no_filters(self):
+        self.assertEqual(['1', '1', '2', '3'], self._reviews())
+
+    def test_role(self):
+        self.assertEqual(['1', '2', '3'], self._reviews('--role', 'owner'))
+
+    def test_teams(self):
+        self.assertEqual(
+            ['1', '1'],
+            self._reviews('--only-team', 'nova', '--only-team', 'other',
+                          '--ignore-team', 'OTHER'),
+        )
+
+    def test_ignore_tag(self):
+        self.assertEqual(
+            ['1', '1', '3'],
+            self._reviews('--ignore-single-vendor'),
+        )
+
+    def test_only_tag(self):
+        self.assertEqual(
+            ['1', '1'],
+            self._reviews('--only-tag', 'team:diverse-affiliation'),
+        )
+
+    def test_only_and_ignore_tag(self):
+        self.assertEqual(
+            [],
+            self._reviews('--only-tag', 'team:diverse-affiliation',
+                          '--ignore-tag', 'team:diverse-affiliation'),
+        )
+
+    def test_highlight_sponsors(self):
+        parsed_args = self.cmd.get_parser('summarize').parse_args(
+            ['--highlight-sponsors', self.col_file])
+        organizations = [
+            row['Organization']
+            for row in self.cmd.get_contributions(parsed_args)
+        ]
+        self.assertEqual(['Red Hat', 'Huawei', '*other', 'SUSE'],
+                         organizations)
+
+    def test_sql_view(self):
+        parsed_args = self.cmd.get_parser('summarize').parse_args(
+            ['--role', 'owner', '--ignore-single-vendor',
+             '--highlight-sponsors', self.col_file])
+        db = sqlite3.connect(':memory:')
+        db.execute(sql.SQL_CREATE)
+        db.executemany(
+            'insert into contribution (review, project, team, role, '
+            'organization) values (:Review, :Project, :Team, :Role, '
+            ':Organization)',
+            _ROWS,
+        )
+        sql.create_filtered_view(
+            db,
+            self.cmd.get_value_tests(parsed_args),
+            self.cmd.get_value_transforms(parsed_args),
+        )
+        self.assertEqual(
+            [('1', 'Red Hat'), ('3', 'SUSE')],
+            db.execute('select review, organization from contribution '
+                       'order by review').fetchall(),
+        )
+
+    def test_sql_view_null_team(self):
+        parsed_args = self.cmd.get_parser('summarize').parse_args(
+            ['--ignore-team', 'nova', '--highlight-sponsors',
+             self.col_file])
+        db = sqlite3.connect(':memory:')
+        db.execute(sql.SQL_CREATE)
+        db.executemany(
+            'insert into contribution (review, team, organization) '
+            'values (?, ?, ?)',
+            [('1', 'Nova', 'Red Hat'), ('2', None, None)],
+        )
+        sql.create_filtered_view(
+            db,
+            self.cmd.get_value_tests(parsed_args),
+            self.cmd.get_value_transforms(parsed_args),
+        )
+        self.assertEqual(
+            [('2', None, '*other')],
+            db.execute('select review, team, organization '
+                       'from contribution').fetchall(),
+        )
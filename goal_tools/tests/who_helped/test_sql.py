@@ -0,0 +1,119 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import datetime
+import os.path
+import sqlite3
+from unittest import mock
+
+from goal_tools import foundation
+from goal_tools import gerrit
+from goal_tools.tests import base
+from goal_tools.who_helped import sql
+
+_QUERY = 'status:merged'
+
+
+def _review(review_id, updated, *emails):
+    review = mock.Mock()
+    review.id = review_id
+    review.url = 'https://review.openstack.org/{}'.format(review_id)
+    review.branch = 'master'
+    review.project = 'openstack/nova'
+    review.updated = updated
+    review.participants = [
+        gerrit.Participant('reviewer', 'Someone', email, updated)
+        for email in emails
+    ]
+    review.plus_ones = []
+    return review
+
+
+class TestDBCreateIncremental(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db_file = os.path.join(self.tmpdir, 'contributions.db')
+        self.app = mock.Mock()
+        self.app.cache = {}
+        self.app.options.slim_cache = False
+        self.app.member_miss_ttl = foundation.MISS_TTL
+        team_data = mock.Mock()
+        team_data.get_repo_owner.return_value = 'Nova'
+        for name, value in [
+                ('goal_tools.governance.Governance', team_data),
+                ('goal_tools.foundation.lookup_members', {})]:
+            patcher = mock.patch(name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run(self, *reviews):
+        "Run the command and return the query string it used."
+        factory = mock.Mock()
+        factory.query.return_value = iter(reviews)
+        cmd = sql.DBCreate(self.app, None)
+        parser = cmd.get_parser('contributions database create')
+        parsed_args = parser.parse_args(
+            ['--incremental', _QUERY, self.db_file])
+        with mock.patch('goal_tools.gerrit.ReviewFactory',
+                        return_value=factory):
+            cmd.take_action(parsed_args)
+        return factory.query.call_args[0][0]
+
+    def _rows(self):
+        db = sqlite3.connect(self.db_file)
+        try:
+            return sorted(db.execute(
+                'select review, email from contribution').fetchall())
+        finally:
+            db.close()
+
+    def _watermark(self):
+        db = sqlite3.connect(self.db_file)
+        try:
+            return db.execute(sql.SQL_SELECT_WATERMARK, (_QUERY,)).fetchone()
+        finally:
+            db.close()
+
+    def test_first_run(self):
+        updated = datetime.datetime(2018, 4, 26, 6, 34, 9)
+        query = self._run(_review('1', updated, 'a@example.com'))
+        self.assertEqual(_QUERY, query)
+        self.assertEqual([('1', 'a@example.com')], self._rows())
+        self.assertEqual(('2018-04-26 06:34:09',), self._watermark())
+
+    def test_second_run(self):
+        first = datetime.datetime(2018, 4, 26, 6, 34, 9)
+        self._run(
+            _review('1', first, 'a@example.com', 'b@example.com'),
+            _review('2', first - datetime.timedelta(days=1),
+                    'c@example.com'),
+        )
+        second = datetime.datetime(2018, 5, 1)
+        query = self._run(_review('1', second, 'd@example.com'))
+        self.assertEqual(gerrit.add_after(_QUERY, first), query)
+        # The rows for the review seen again are replaced, and the
+        # others are kept.
+        self.assertEqual(
+            [('1', 'd@example.com'), ('2', 'c@example.com')],
+            self._rows(),
+        )
+        self.assertEqual(('2018-05-01 00:00:00',), self._watermark())
+
+    def test_no_changes_keeps_watermark(self):
+        updated = datetime.datetime(2018, 4, 26, 6, 34, 9)
+        self._run(_review('1', updated, 'a@example.com'))
+        query = self._run()
+        self.assertEqual(gerrit.add_after(_QUERY, updated), query)
+        self.assertEqual([('1', 'a@example.com')], self._rows())
+        self.assertEqual(('2018-04-26 06:34:09',), self._watermark())
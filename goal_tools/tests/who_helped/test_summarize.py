@@ -10,8 +10,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from goal_tools.who_helped import summarize
+import argparse
+import csv
+import os.path
+from unittest import mock
+
+from goal_tools import columnar
 from goal_tools.tests import base
+from goal_tools.who_helped import summarize
 
 
 class TestSummarizeBy(base.TestCase):
@@ -65,6 +71,143 @@ class TestSummarizeBy(base.TestCase):
         }
         self.assertEqual(expected, results)
 
+    def test_count_contributions(self):
+        results = summarize._count_distinct(
+            ['a'], ['contributions'], self._data)
+        expected = {
+            ('A',): 2,
+        }
+        self.assertEqual(expected, results)
+
+    def test_count_repeated_rows(self):
+        results = summarize._count_distinct(
+            ['a'], [], self._data + self._data)
+        expected = {
+            ('A',): 4,
+        }
+        self.assertEqual(expected, results)
+
+
+class TestSummary(base.TestCase):
+
+    _data = [
+        {'a': 'A', 'b': 'B', 'c': 'C'},
+        {'a': 'A', 'b': 'C', 'c': 'C'},
+        {'a': 'A', 'b': 'C', 'c': 'D'},
+        {'a': 'B', 'b': 'B', 'c': 'C'},
+    ]
+
+    def _results(self, **kwds):
+        args = dict(by=['a'], count=[], anonymize=False,
+                    approximate=False, error_rate=0.01)
+        args.update(kwds)
+        summary = summarize.Summary(argparse.Namespace(**args))
+        for row in self._data:
+            summary.add(row)
+        columns, rows = summary.get_results()
+        return columns, list(rows)
+
+    def test_count_contributions(self):
+        self.assertEqual(
+            (('a', 'Contributions'), [('A', 3), ('B', 1)]),
+            self._results(),
+        )
+
+    def test_approximate(self):
+        self.assertEqual(
+            (('a', 'b, c'), [('A', 3), ('B', 1)]),
+            self._results(count=['b', 'c'], approximate=True),
+        )
+
+    def test_approximate_contributions(self):
+        self.assertEqual(
+            (('a', 'Contributions'), [('A', 3), ('B', 1)]),
+            self._results(approximate=True),
+        )
+
+    def _table_results(self, where=None, **kwds):
+        filename = os.path.join(self.tmpdir, 'data.col')
+        columnar.write(filename, ['a', 'b', 'c'], self._data)
+        args = dict(by=['a'], count=[], anonymize=False,
+                    approximate=False, error_rate=0.01)
+        args.update(kwds)
+        summary = summarize.Summary(argparse.Namespace(**args))
+        # Rows added either way are counted together.
+        summary.add({'a': 'C', 'b': 'B', 'c': 'C'})
+        table = columnar.Table(filename)
+        try:
+            summary.add_table(table, where)
+        finally:
+            table.close()
+        columns, rows = summary.get_results()
+        return columns, list(rows)
+
+    def test_table(self):
+        self.assertEqual(
+            (('a', 'b'), [('A', 2), ('C', 1), ('B', 1)]),
+            self._table_results(count=['b']),
+        )
+
+    def test_table_where(self):
+        self.assertEqual(
+            (('a', 'Contributions'), [('A', 2), ('C', 1), ('B', 1)]),
+            self._table_results({'c': 'C'.__eq__}),
+        )
+
+    def test_table_approximate(self):
+        self.assertEqual(
+            (('a', 'b'), [('A', 2), ('C', 1), ('B', 1)]),
+            self._table_results(count=['b'], approximate=True),
+        )
+
+
+class TestSummarizeContributions(base.TestCase):
+
+    _columns = ['Organization', 'Role', 'Name']
+
+    _rows = [
+        {'Organization': 'Red Hat', 'Role': 'owner', 'Name': 'a'},
+        {'Organization': 'Red Hat', 'Role': 'reviewer', 'Name': 'b'},
+        {'Organization': 'SUSE', 'Role': 'owner', 'Name': 'c'},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.csv_file = os.path.join(self.tmpdir, 'data.csv')
+        with open(self.csv_file, 'w', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, self._columns)
+            writer.writeheader()
+            writer.writerows(self._rows)
+        self.col_file = os.path.join(self.tmpdir, 'data.col')
+        columnar.write(self.col_file, self._columns, self._rows)
+
+    def _results(self, *args):
+        cmd = summarize.SummarizeContributions(mock.Mock(), None)
+        parsed_args = cmd.get_parser('summarize').parse_args(args)
+        columns, rows = cmd.take_action(parsed_args)
+        return list(rows)
+
+    def test_mixed_formats(self):
+        self.assertEqual(
+            [('SUSE', 2), ('Red Hat', 2)],
+            self._results('--role', 'owner',
+                          self.csv_file, self.col_file),
+        )
+
+    def test_mixed_formats_distinct(self):
+        # The same people are in both files, so are only counted once.
+        self.assertEqual(
+            [('SUSE', 1), ('Red Hat', 1)],
+            self._results('--role', 'owner', '--count', 'Name',
+                          self.csv_file, self.col_file),
+        )
+
+    def test_formats_match(self):
+        self.assertEqual(
+            self._results('--by', 'Role', self.csv_file),
+            self._results('--by', 'Role', self.col_file),
+        )
+
 
 class TestAnonymize(base.TestCase):
 
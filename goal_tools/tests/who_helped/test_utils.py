@@ -10,8 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from goal_tools import utils
+import argparse
+import io
+from unittest import mock
+
 from goal_tools.tests import base
+from goal_tools import utils
 
 
 class TestUnique(base.TestCase):
@@ -27,3 +31,25 @@ class TestUnique(base.TestCase):
         expected = 'abc'
         actual = ''.join(utils.unique(input))
         self.assertEqual(expected, actual)
+
+
+class TestVersionOption(base.TestCase):
+
+    def test_replaces_existing(self):
+        parser = argparse.ArgumentParser(
+            prog='tool', **utils.version_parser_kwargs())
+        parser.add_argument('--version', action='version', version='old')
+        utils.add_version_option(parser)
+        version = mock.Mock()
+        version.version_string.return_value = '1.2.3'
+        stderr = io.StringIO()
+        with mock.patch('pbr.version.VersionInfo', return_value=version), \
+                mock.patch('sys.stderr', stderr):
+            self.assertRaises(SystemExit, parser.parse_args, ['--version'])
+        self.assertEqual('tool 1.2.3\n', stderr.getvalue())
+
+    def test_keeps_other_kwargs(self):
+        self.assertEqual(
+            {'add_help': False, 'conflict_handler': 'resolve'},
+            utils.version_parser_kwargs({'add_help': False}),
+        )
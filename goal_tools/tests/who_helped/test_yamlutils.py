@@ -0,0 +1,80 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+from unittest import mock
+
+import fixtures
+
+from goal_tools.tests import base
+from goal_tools import yamlutils
+
+
+class TestLoad(base.TestCase):
+
+    def test_load(self):
+        self.assertEqual({'a': [1, 2]}, yamlutils.load('a:\n  - 1\n  - 2\n'))
+
+
+class TestLoadPackageData(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.useFixture(fixtures.MonkeyPatch(
+            'goal_tools.yamlutils._package_data', {}))
+
+    def test_saves_parsed_copy(self):
+        data = yamlutils.load_package_data('sponsors.yaml', self.tmpdir)
+        self.assertIn('platinum', data)
+        saved = os.listdir(self.tmpdir)
+        self.assertEqual(1, len(saved))
+        self.assertTrue(saved[0].startswith('sponsors-'))
+
+    def test_uses_parsed_copy(self):
+        expected = yamlutils.load_package_data('sponsors.yaml', self.tmpdir)
+        yamlutils._package_data.clear()
+        with mock.patch('goal_tools.yamlutils.load') as load:
+            load.side_effect = AssertionError('should not be called')
+            data = yamlutils.load_package_data('sponsors.yaml', self.tmpdir)
+        self.assertEqual(expected, data)
+
+    def test_shared_in_process(self):
+        first = yamlutils.load_package_data('sponsors.yaml', None)
+        second = yamlutils.load_package_data('sponsors.yaml', None)
+        self.assertIs(first, second)
+
+    def test_unreadable_copy_ignored(self):
+        yamlutils.load_package_data('sponsors.yaml', self.tmpdir)
+        yamlutils._package_data.clear()
+        for name in os.listdir(self.tmpdir):
+            with open(os.path.join(self.tmpdir, name), 'wb') as f:
+                f.write(b'not a pickle')
+        data = yamlutils.load_package_data('sponsors.yaml', self.tmpdir)
+        self.assertIn('platinum', data)
+
+    def test_stale_copy_removed(self):
+        stale = os.path.join(self.tmpdir, 'sponsors-0123.pickle')
+        other = os.path.join(self.tmpdir, 'organizations-0123.pickle')
+        for name in (stale, other):
+            with open(name, 'wb') as f:
+                f.write(b'old')
+        yamlutils.load_package_data('sponsors.yaml', self.tmpdir)
+        saved = sorted(os.listdir(self.tmpdir))
+        self.assertEqual(2, len(saved))
+        self.assertEqual('organizations-0123.pickle', saved[0])
+        self.assertNotIn('sponsors-0123.pickle', saved)
+
+    def test_default_directory(self):
+        yamlutils.load_package_data('sponsors.yaml')
+        saved = os.listdir(self.tmpdir)
+        self.assertEqual(1, len(saved))
+        self.assertTrue(saved[0].startswith('sponsors-'))
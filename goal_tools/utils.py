@@ -10,11 +10,53 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import argparse
 import logging
 
 LOG = logging.getLogger(__name__)
 
 
+class VersionAction(argparse.Action):
+    """Report the package version for --version.
+
+    Looking up the version with pbr is slow, so it is only done when
+    the option is used instead of every time an app starts.
+
+    """
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS,
+                 default=argparse.SUPPRESS,
+                 help="show program's version number and exit"):
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        import pbr.version
+        version = pbr.version.VersionInfo('goal-tools').version_string()
+        parser.exit(message='{} {}\n'.format(parser.prog, version))
+
+
+def version_parser_kwargs(argparse_kwargs=None):
+    """Return the argparse options for an app's top-level parser.
+
+    Pass the result to cliff's App.build_option_parser() so the
+    --version option added by add_version_option() can replace the one
+    from cliff.
+
+    """
+    return dict(argparse_kwargs or {}, conflict_handler='resolve')
+
+
+def add_version_option(parser):
+    "Add a --version option that only looks up the version when used."
+    parser.add_argument('--version', action=VersionAction)
+
+
 def unique(iterator):
     """Iterator that only returns unique values from its input.
 
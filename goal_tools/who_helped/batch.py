@@ -0,0 +1,171 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import logging
+import operator
+import shlex
+
+from cliff import command
+import stevedore
+
+from goal_tools.who_helped import summarize
+from goal_tools import yamlutils
+
+LOG = logging.getLogger(__name__)
+
+_SUMMARIZE_NAME = 'contributions summarize'
+
+
+def load_spec(filename):
+    """Read the list of reports from a batch spec file.
+
+    The spec is a YAML list with an entry for each report. Each entry
+    has an ``output`` file name and ``args``, the options for
+    ``contributions summarize`` as a string or list.
+
+    :param filename: The spec file.
+    :type filename: str
+
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        spec = yamlutils.load(f)
+    if not isinstance(spec, list):
+        raise ValueError('{} should contain a list of reports'.format(
+            filename))
+    reports = []
+    for entry in spec:
+        if not isinstance(entry, dict) or 'output' not in entry:
+            raise ValueError('report in {} has no output: {!r}'.format(
+                filename, entry))
+        args = entry.get('args') or []
+        if isinstance(args, str):
+            args = shlex.split(args)
+        reports.append((entry['output'], [str(a) for a in args]))
+    return reports
+
+
+def _normalize_column(name):
+    return name.lower().strip().replace(' ', '_')
+
+
+def _select_columns(parsed_args, columns, data):
+    """Apply the column and sort options of a report to its results.
+
+    Matches the handling of ``--column`` and ``--sort-column`` in
+    cliff's Lister, for writing the results without running the
+    command.
+
+    """
+    for name in reversed(parsed_args.sort_columns):
+        if name in columns:
+            data = sorted(
+                data,
+                key=operator.itemgetter(columns.index(name)),
+                reverse=parsed_args.sort_direction == 'desc',
+            )
+    if not parsed_args.columns:
+        return (columns, data)
+    wanted = set(_normalize_column(c) for c in parsed_args.columns)
+    indexes = [
+        i for i, name in enumerate(columns)
+        if _normalize_column(name) in wanted
+    ]
+    if not indexes:
+        raise ValueError('No recognized column names in {}. '
+                         'Recognized columns are {}.'.format(
+                             parsed_args.columns, list(columns)))
+    return (
+        [columns[i] for i in indexes],
+        ([row[i] for i in indexes] for row in data),
+    )
+
+
+class _Report:
+    "One summary being produced by a batch."
+
+    def __init__(self, app, app_args, output, args, contribution_list):
+        self.output = output
+        self.cmd = summarize.SummarizeContributions(app, app_args)
+        parser = self.cmd.get_parser(_SUMMARIZE_NAME)
+        self.parsed_args = parser.parse_args(args + contribution_list)
+        self.row_filter = self.cmd.get_row_filter(self.parsed_args)
+        self.summary = summarize.Summary(self.parsed_args)
+
+    def add(self, row):
+        row = self.row_filter(row)
+        if row is not None:
+            self.summary.add(row)
+
+    def write(self, formatters):
+        """Write the report with the formatter selected in its options.
+
+        :param formatters: The formatter plugins, by name.
+        :type formatters: dict
+
+        """
+        formatter = formatters[self.parsed_args.formatter]
+        columns, data = _select_columns(
+            self.parsed_args, *self.summary.get_results())
+        LOG.debug('writing %s', self.output)
+        with open(self.output, 'w', encoding='utf-8') as f:
+            formatter.emit_list(columns, data, f, self.parsed_args)
+
+
+class BatchContributions(command.Command):
+    """Produce several summaries with one pass over the contributions.
+
+    Each report in the spec file is the same as running
+    "contributions summarize" with its args and writing the output to
+    its file, but the contribution data is read only once.
+
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            'spec',
+            help=('YAML file listing the reports, each with an "output" '
+                  'file and the "args" for "contributions summarize"'),
+        )
+        parser.add_argument(
+            'contribution_list',
+            nargs='+',
+            help=('name(s) of files containing contribution details, '
+                  'as CSV or converted with "contributions convert"'),
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        reports = [
+            _Report(self.app, self.app_args, output, args,
+                    parsed_args.contribution_list)
+            for output, args in load_spec(parsed_args.spec)
+        ]
+        if not reports:
+            LOG.warning('no reports in %s', parsed_args.spec)
+            return
+
+        # Every report reads the same files, so use the first to read
+        # them for all of the others.
+        for row in reports[0].cmd.read_contributions(reports[0].parsed_args):
+            for report in reports:
+                report.add(row)
+
+        formatters = {
+            extension.name: extension.obj
+            for extension in stevedore.ExtensionManager(
+                reports[0].cmd.formatter_namespace,
+                invoke_on_load=True,
+            )
+        }
+        for report in reports:
+            report.write(formatters)
@@ -17,6 +17,9 @@ import pprint
 
 from cliff import command
 
+from goal_tools import foundation
+from goal_tools import gerrit
+
 LOG = logging.getLogger(__name__)
 
 
@@ -27,7 +30,7 @@ class CacheRemove(command.Command):
         parser = super().get_parser(prog_name)
         parser.add_argument(
             'type',
-            choices=['review', 'email'],
+            choices=['review', 'member', 'email'],
             help='the kind of thing to remove',
         )
         parser.add_argument(
@@ -37,7 +40,7 @@ class CacheRemove(command.Command):
         return parser
 
     def take_action(self, parsed_args):
-        cache = self.app._load_cache_file(preload=False)
+        cache = self.app.cache
         del cache[(parsed_args.type, parsed_args.id)]
 
 
@@ -48,7 +51,7 @@ class CacheShow(command.Command):
         parser = super().get_parser(prog_name)
         parser.add_argument(
             'type',
-            choices=['review', 'email'],
+            choices=['review', 'member', 'email'],
             help='the kind of thing to remove',
         )
         parser.add_argument(
@@ -58,9 +61,19 @@ class CacheShow(command.Command):
         return parser
 
     def take_action(self, parsed_args):
-        cache = self.app._load_cache_file(preload=False)
+        cache = self.app.cache
         try:
             data = cache[(parsed_args.type, parsed_args.id)]
+            if parsed_args.type == 'review':
+                if gerrit.is_open_entry(data):
+                    print('revalidate: {}'.format(data['_revalidate']))
+                    data = data['change']
+                data = gerrit.unpack_change(data)
+            elif parsed_args.type == 'member':
+                if foundation.is_miss_entry(data):
+                    print('not a member, checked {} ago'.format(
+                        foundation.miss_entry_age(data)))
+                    return
             pprint.pprint(data)
         except KeyError:
             msg = 'no {} with id {}'.format(parsed_args.type, parsed_args.id)
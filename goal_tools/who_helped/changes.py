@@ -12,7 +12,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import logging
+import os.path
 
 from cliff import command
 
@@ -21,6 +23,24 @@ from goal_tools import governance
 
 LOG = logging.getLogger(__name__)
 
+# The review list records the newest update time seen in a comment so
+# the next incremental run knows where to start.
+_UPDATED_PREFIX = '# UPDATED: '
+
+
+def read_watermark(filename):
+    "Return the update time recorded in a review list, or None."
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith('#'):
+                break
+            if line.startswith(_UPDATED_PREFIX):
+                return datetime.datetime.strptime(
+                    line[len(_UPDATED_PREFIX):].strip(),
+                    gerrit.TIME_FORMAT,
+                )
+    return None
+
 
 class QueryChanges(command.Command):
     "Query gerrit for a set of changes and build a review ID file."
@@ -38,6 +58,34 @@ class QueryChanges(command.Command):
             action='store_true',
             help='include projects not under governance in the output',
         )
+        parser.add_argument(
+            '--incremental',
+            default=False,
+            action='store_true',
+            help=('add the changes modified since the last run to an '
+                  'existing review list'),
+        )
+        parser.add_argument(
+            '--page-size',
+            default=200,
+            type=int,
+            help=('number of changes to request from gerrit at once '
+                  '(defaults to %(default)s)'),
+        )
+        parser.add_argument(
+            '--lookahead',
+            default=2,
+            type=int,
+            help=('number of result pages to request while processing '
+                  'the current one (defaults to %(default)s)'),
+        )
+        parser.add_argument(
+            '--stream',
+            default=False,
+            action='store_true',
+            help=('decode gerrit results as they arrive to save memory '
+                  '(ignores --lookahead)'),
+        )
         parser.add_argument(
             'query_string',
             help='gerrit query string',
@@ -53,13 +101,34 @@ class QueryChanges(command.Command):
             url=parsed_args.governance_project_list)
 
         review_ids = []
+        query_string = parsed_args.query_string
+        watermark = None
 
-        cache = self.app._load_cache_file(preload=False)
+        if parsed_args.incremental and os.path.exists(parsed_args.review_list):
+            watermark = read_watermark(parsed_args.review_list)
+            review_ids.extend(
+                int(rid)
+                for rid in gerrit.parse_review_lists([parsed_args.review_list])
+            )
+            if watermark:
+                LOG.info('fetching changes updated after %s', watermark)
+                query_string = gerrit.add_after(query_string, watermark)
 
-        factory = gerrit.ReviewFactory(cache)
+        cache = self.app.cache
 
-        review_source = factory.query(parsed_args.query_string)
+        factory = gerrit.ReviewFactory(
+            cache, slim=self.app.options.slim_cache)
+
+        review_source = factory.query(
+            query_string,
+            page_size=parsed_args.page_size,
+            lookahead=parsed_args.lookahead,
+            stream=parsed_args.stream,
+        )
         for review in review_source:
+            updated = review.updated
+            if updated and (watermark is None or updated > watermark):
+                watermark = updated
             team_name = team_data.get_repo_owner(review.project)
             if not parsed_args.include_unofficial and not team_name:
                 LOG.debug(
@@ -72,5 +141,8 @@ class QueryChanges(command.Command):
         with open(parsed_args.review_list, 'w', encoding='utf-8') as f:
             f.write('# QUERY: {}\n'.format(
                 parsed_args.query_string.replace('\n', ' ')))
-            for rid in sorted(review_ids):
+            if watermark:
+                f.write('{}{}\n'.format(
+                    _UPDATED_PREFIX, watermark.strftime(gerrit.TIME_FORMAT)))
+            for rid in sorted(set(review_ids)):
                 f.write('{}\n'.format(rid))
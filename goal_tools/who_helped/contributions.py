@@ -12,12 +12,13 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import itertools
 import logging
 
 from cliff import columns
 from cliff import lister
 
+from goal_tools import attribution
+from goal_tools import caching
 from goal_tools import foundation
 from goal_tools import gerrit
 from goal_tools import governance
@@ -61,6 +62,20 @@ class ListContributions(lister.Lister):
             action='store_true',
             help='include +1 votes',
         )
+        parser.add_argument(
+            '--workers',
+            default=8,
+            type=int,
+            help=('number of reviews to fetch from gerrit at the same time '
+                  '(defaults to %(default)s)'),
+        )
+        parser.add_argument(
+            '--prefetch',
+            default=False,
+            action='store_true',
+            help=('look up uncached reviews in batches before '
+                  'building the report'),
+        )
         parser.add_argument(
             'review_list',
             nargs='+',
@@ -74,47 +89,37 @@ class ListContributions(lister.Lister):
             team_data = governance.Governance(
                 url=parsed_args.governance_project_list)
 
-            member_factory = foundation.MemberFactory(self.app.cache)
-            review_factory = gerrit.ReviewFactory(self.app.cache)
+            member_factory = foundation.MemberFactory(
+                self.app.cache, miss_ttl=self.app.member_miss_ttl)
+            review_factory = gerrit.ReviewFactory(
+                self.app.cache, slim=self.app.options.slim_cache)
             canonical_orgs = organizations.Organizations()
 
             review_ids = utils.unique(
                 gerrit.parse_review_lists(parsed_args.review_list)
             )
-
-            for review_id in review_ids:
-
-                review = review_factory.fetch(review_id)
-
-                team_name = team_data.get_repo_owner(review.project)
-
-                if parsed_args.include_plus_one:
-                    participants = itertools.chain(
-                        review.participants,
-                        review.plus_ones,
-                    )
-                else:
-                    participants = review.participants
-
-                for participant in participants:
-
-                    # Figure out which organization the user was
-                    # affiliated with at the time of the work.
-                    organization = None
-                    member = member_factory.fetch(participant.email)
-                    if member:
-                        affiliation = member.find_affiliation(participant.date)
-                        if affiliation and affiliation.organization:
-                            organization = canonical_orgs[
-                                affiliation.organization]
-                    else:
-                        organization = canonical_orgs.from_email(
-                            participant.email)
-                    if not organization:
-                        organization = "*unknown"
-
+            if parsed_args.prefetch:
+                review_ids = list(review_ids)
+                review_factory.prefetch(review_ids)
+
+            reviews = review_factory.fetch_many(
+                review_ids, workers=parsed_args.workers)
+
+            def participants():
+                for review in reviews:
+                    for participant in review.participants:
+                        yield (review, participant)
+                    if parsed_args.include_plus_one:
+                        for participant in review.plus_ones:
+                            yield (review, participant)
+
+            chunks = attribution.attribute(
+                participants(), member_factory, canonical_orgs)
+            for chunk in chunks:
+                for review, participant, organization in chunk:
+                    team_name = team_data.get_repo_owner(review.project)
                     yield (
-                        review_id,
+                        review.id,
                         review.url,
                         review.branch,
                         review.project,
@@ -127,4 +132,8 @@ class ListContributions(lister.Lister):
                         organization,
                     )
 
+            for obj in (team_data, member_factory, canonical_orgs):
+                LOG.debug('%s lookups: %s', type(obj).__name__,
+                          caching.memo_stats(obj))
+
         return (_COLUMNS, make_rows())
@@ -0,0 +1,48 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import csv
+import logging
+
+from cliff import command
+
+from goal_tools import columnar
+
+LOG = logging.getLogger(__name__)
+
+
+class ConvertContributions(command.Command):
+    """Convert a CSV contribution report to the columnar format.
+
+    The report commands read the columnar file much faster than the
+    CSV, so convert a report once before summarizing it several ways.
+
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            'input_file',
+            help='CSV file produced by "contributions list"',
+        )
+        parser.add_argument(
+            'output_file',
+            help='columnar file to create',
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        LOG.debug('reading %s', parsed_args.input_file)
+        with open(parsed_args.input_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            columnar.write(parsed_args.output_file,
+                           reader.fieldnames or [], reader)
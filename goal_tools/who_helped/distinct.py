@@ -12,6 +12,7 @@
 
 import logging
 
+from goal_tools import hyperloglog
 from goal_tools.who_helped import contributions
 from goal_tools.who_helped import report
 
@@ -25,6 +26,13 @@ def _get_distinct(by_names, data_source):
     )
 
 
+def _estimate_distinct(by_names, data_source, error_rate):
+    sketch = hyperloglog.HyperLogLog(error_rate)
+    for row in data_source:
+        sketch.add(hyperloglog.SEPARATOR.join(row[b] for b in by_names))
+    return len(sketch)
+
+
 class DistinctContributions(report.ContributionsReportBase):
     "Show distinct values in a contribution report."
 
@@ -38,6 +46,7 @@ class DistinctContributions(report.ContributionsReportBase):
             help=('column(s) to summarize by (may be repeated), '
                   'defaults to "Organization"'),
         )
+        report.add_approximate_arguments(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -47,6 +56,13 @@ class DistinctContributions(report.ContributionsReportBase):
 
         data = self.get_contributions(parsed_args)
 
+        if parsed_args.approximate:
+            # Report how many distinct values there are, since the
+            # values themselves are not kept.
+            estimate = _estimate_distinct(
+                group_by, data, parsed_args.error_rate)
+            return ((', '.join(group_by),), [(estimate,)])
+
         values = _get_distinct(group_by, data)
 
         output_rows = sorted(values)
@@ -12,14 +12,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import logging
 import sys
 
 from cliff import app
 from cliff import commandmanager
-import pbr.version
 
+from goal_tools import apis
 from goal_tools import caching
+from goal_tools import foundation
+from goal_tools import utils
 
 
 class WhoHelped(app.App):
@@ -27,9 +30,8 @@ class WhoHelped(app.App):
     """
 
     def __init__(self):
-        version_info = pbr.version.VersionInfo('goal-tools')
         super().__init__(
-            version=version_info.version_string(),
+            version=None,
             description='contributor stats query tool',
             command_manager=commandmanager.CommandManager('who_helped'),
             deferred_help=False,
@@ -37,23 +39,79 @@ class WhoHelped(app.App):
 
     def build_option_parser(self, description, version,
                             argparse_kwargs=None):
-        parser = super().build_option_parser(description, version,
-                                             argparse_kwargs)
+        parser = super().build_option_parser(
+            description, version,
+            utils.version_parser_kwargs(argparse_kwargs),
+        )
+        utils.add_version_option(parser)
         parser.add_argument(
             '--cache-file',
             default='./who_helped.db',
             help=('cache file for data fetched from APIs '
                   '(defaults to %(default)s)'),
         )
+        parser.add_argument(
+            '--cache-max-entries',
+            default=10000,
+            type=int,
+            help=('number of cached items to keep in memory '
+                  '(defaults to %(default)s)'),
+        )
+        parser.add_argument(
+            '--cache-max-bytes',
+            default=None,
+            type=int,
+            help=('size of the pickled cache items to keep in memory, '
+                  'in bytes (defaults to no limit)'),
+        )
+        parser.add_argument(
+            '--http-pool-size',
+            default=apis.POOL_MAXSIZE,
+            type=int,
+            help=('number of HTTP connections to keep open to each '
+                  'server (defaults to %(default)s)'),
+        )
+        parser.add_argument(
+            '--slim-cache',
+            default=False,
+            action='store_true',
+            help=('store only the review fields needed for reports, '
+                  'compressed, when adding reviews to the cache'),
+        )
+        parser.add_argument(
+            '--member-miss-ttl',
+            default=foundation.MISS_TTL.days,
+            type=int,
+            help=('days to remember that an email address does not '
+                  'belong to a Foundation member before checking again '
+                  '(defaults to %(default)s)'),
+        )
         return parser
 
+    @property
+    def member_miss_ttl(self):
+        return datetime.timedelta(days=self.options.member_miss_ttl)
+
     def initialize_app(self, argv):
         # Quiet the urllib3 module output coming out of requests.
         logging.getLogger('urllib3').setLevel(logging.WARNING)
+        apis.configure_session(pool_maxsize=self.options.http_pool_size)
         self._cache = None
 
-    def _load_cache_file(self, preload=True):
-        return caching.Cache(self.options.cache_file, preload=preload)
+    def clean_up(self, cmd, result, err):
+        if isinstance(self._cache, caching.Cache):
+            self.LOG.debug('cache stats: %s', self._cache.stats)
+            self._cache.close()
+            # Interactive mode runs more commands after this one, so
+            # open the cache again if they need it.
+            self._cache = None
+
+    def _load_cache_file(self):
+        return caching.Cache(
+            self.options.cache_file,
+            max_entries=self.options.cache_max_entries,
+            max_bytes=self.options.cache_max_bytes,
+        )
 
     @property
     def cache(self):
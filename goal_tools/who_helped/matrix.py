@@ -10,11 +10,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import csv
 import logging
 
 from cliff import lister
 
+from goal_tools import columnar
+
 LOG = logging.getLogger(__name__)
 
 
@@ -37,7 +38,7 @@ class MatrixContributions(lister.Lister):
         )
         parser.add_argument(
             'input_file',
-            help='Name of CSV file with data',
+            help='Name of CSV or columnar file with data',
         )
         return parser
 
@@ -48,14 +49,11 @@ class MatrixContributions(lister.Lister):
                      parsed_args.value_name)
 
         LOG.debug('reading %s', parsed_args.input_file)
-        with open(parsed_args.input_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-
-            y_values = set()
-            reorg_data = {}
-            for row in reader:
-                reorg_data.setdefault(row[x], {})[row[y]] = row[val]
-                y_values.add(row[y])
+        y_values = set()
+        reorg_data = {}
+        for row in columnar.read_rows(parsed_args.input_file):
+            reorg_data.setdefault(row[x], {})[row[y]] = row[val]
+            y_values.add(row[y])
 
         column_names = [y]
         column_names.extend(sorted(reorg_data.keys()))
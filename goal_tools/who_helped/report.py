@@ -10,17 +10,48 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import csv
+import argparse
 import logging
 
 from cliff import lister
 
+from goal_tools import columnar
 from goal_tools import governance
+from goal_tools import hyperloglog
 from goal_tools import sponsors
 
 LOG = logging.getLogger(__name__)
 
 
+def _error_rate(value):
+    try:
+        rate = float(value)
+    except ValueError:
+        rate = None
+    if rate is None or not 0 < rate < 1:
+        raise argparse.ArgumentTypeError(
+            'expected a number between 0 and 1, got {!r}'.format(value))
+    return rate
+
+
+def add_approximate_arguments(parser):
+    "Add the options for estimating distinct counts."
+    parser.add_argument(
+        '--approximate',
+        default=False,
+        action='store_true',
+        help=('estimate the distinct counts using less memory, '
+              'instead of keeping every value'),
+    )
+    parser.add_argument(
+        '--error-rate',
+        default=hyperloglog.DEFAULT_ERROR_RATE,
+        type=_error_rate,
+        help=('relative standard error of the estimates with '
+              '--approximate, defaults to %(default)s'),
+    )
+
+
 class ContributionsReportBase(lister.Lister):
     "Base class for commands that report about contributions."
 
@@ -95,72 +126,126 @@ class ContributionsReportBase(lister.Lister):
         parser.add_argument(
             'contribution_list',
             nargs='+',
-            help='name(s) of files containing contribution details',
+            help=('name(s) of files containing contribution details, '
+                  'as CSV or converted with "contributions convert"'),
         )
         return parser
 
-    def get_contributions(self, parsed_args):
+    def read_contributions(self, parsed_args, where=None):
+        """Iterate over the rows of all of the input files.
+
+        :param where: Functions taking a value from the column and
+            returning whether to keep the row, by column name.
+        :type where: dict
+
+        """
+        for filename in parsed_args.contribution_list:
+            LOG.debug('reading %s', filename)
+            yield from columnar.read_rows(filename, where)
 
-        def rows():
-            for filename in parsed_args.contribution_list:
-                LOG.debug('reading %s', filename)
-                with open(filename, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    yield from reader
+    def get_value_tests(self, parsed_args):
+        """Return the filter options as tests of single column values.
 
-        data = rows()
+        The result maps column names to functions that take a value
+        from that column and return whether rows with the value
+        should be reported. A row is reported if it passes all of the
+        tests. The tag options are turned into a set of the projects
+        to keep or skip, so they are not looked up for each row.
 
-        roles = parsed_args.role
+        """
+        tests = {}
+
+        roles = set(parsed_args.role)
         if roles:
-            data = (d for d in data if d['Role'] in roles)
+            tests['Role'] = roles.__contains__
 
         ignore_teams = set(t.lower() for t in parsed_args.ignore_team)
-        if ignore_teams:
-            data = (d for d in data if d['Team'].lower() not in ignore_teams)
-
         only_teams = set(t.lower() for t in parsed_args.only_team)
-        if only_teams:
-            data = (d for d in data if d['Team'].lower() in only_teams)
+        if ignore_teams or only_teams:
+            def team_test(team):
+                team = team.lower()
+                if team in ignore_teams:
+                    return False
+                return not only_teams or team in only_teams
+            tests['Team'] = team_test
 
         if parsed_args.only_sponsors:
             sponsor_map = sponsors.Sponsors(parsed_args.sponsor_level)
-
-            data = (
-                d
-                for d in data
-                if d['Organization'] in sponsor_map
-            )
+            tests['Organization'] = sponsor_map.__contains__
 
         ignore_tags = set(parsed_args.ignore_tag)
-        if ignore_tags:
+        only_tags = set(parsed_args.only_tag)
+        if ignore_tags or only_tags:
             team_data = governance.Governance(
                 url=parsed_args.governance_project_list)
+            ignored = set()
+            for tag in ignore_tags:
+                ignored.update(team_data.get_tagged_repos(tag))
+            if only_tags:
+                allowed = set.intersection(*(
+                    team_data.get_tagged_repos(tag) for tag in only_tags
+                ))
+                allowed.difference_update(ignored)
+                tests['Project'] = allowed.__contains__
+            else:
+                tests['Project'] = lambda project: project not in ignored
+
+        return tests
+
+    def get_value_transforms(self, parsed_args):
+        """Return the functions to change the values of reported rows.
+
+        The result maps column names to functions that take a value
+        from that column and return the value to report.
+
+        """
+        transforms = {}
+        if parsed_args.highlight_sponsors:
+            sponsor_map = sponsors.Sponsors(parsed_args.sponsor_level)
+            transforms['Organization'] = sponsor_map.__getitem__
+        return transforms
 
-            data = (
-                d
-                for d in data
-                if not team_data.get_repo_tags(d['Project']).intersection(
-                    ignore_tags)
-            )
+    def _get_row_transform(self, parsed_args):
+        transforms = list(self.get_value_transforms(parsed_args).items())
+        if not transforms:
+            return None
 
-        only_tags = set(parsed_args.only_tag)
-        if only_tags:
-            team_data = governance.Governance(
-                url=parsed_args.governance_project_list)
+        def row_transform(row):
+            row = dict(row)
+            for name, transform in transforms:
+                row[name] = transform(row[name])
+            return row
 
-            data = (
-                d
-                for d in data
-                if only_tags.issubset(team_data.get_repo_tags(d['Project']))
-            )
+        return row_transform
 
-        if parsed_args.highlight_sponsors:
-            sponsor_map = sponsors.Sponsors(parsed_args.sponsor_level)
+    def get_row_filter(self, parsed_args):
+        """Return a function to apply the filter options to one row.
+
+        The function returns None for rows that should be skipped, and
+        otherwise the row to report. Rows are copied rather than
+        modified, so the same row can be passed to the filters for
+        several reports.
 
-            def filter_sponsors(row):
-                row['Organization'] = sponsor_map[row['Organization']]
-                return row
+        """
+        tests = self.get_value_tests(parsed_args)
+        row_test = columnar.make_row_test(tests) if tests else None
+        row_transform = self._get_row_transform(parsed_args)
 
-            data = (filter_sponsors(d) for d in data)
+        def row_filter(row):
+            if row_test is not None and not row_test(row):
+                return None
+            if row_transform is not None:
+                return row_transform(row)
+            return row
 
+        return row_filter
+
+    def get_contributions(self, parsed_args):
+        # Give the tests to the reader so they are applied to the
+        # distinct values of a columnar file instead of each row.
+        data = self.read_contributions(
+            parsed_args, self.get_value_tests(parsed_args))
+        row_transform = self._get_row_transform(parsed_args)
+        if row_transform is not None:
+            data = map(row_transform, data)
         return data
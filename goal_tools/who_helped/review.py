@@ -42,10 +42,16 @@ class ReviewShow(command.Command):
 
     def take_action(self, parsed_args):
         review_id = gerrit.parse_review_id(parsed_args.id)
-        cache = self.app._load_cache_file(preload=False)
+        cache = self.app.cache
         try:
             data = cache[('review', review_id)]
         except KeyError:
+            data = None
+        if (data is None or gerrit.is_packed(data) or
+                gerrit.is_open_entry(data)):
+            # The slim cache format drops most of the details and
+            # unmerged reviews may be out of date, so fetch the full
+            # payload to show.
             rev = gerrit.ReviewFactory({}).fetch(review_id)
             data = rev._data
         if parsed_args.json:
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import itertools
 import logging
 import os.path
@@ -18,6 +19,8 @@ import sqlite3
 from cliff import command
 
 from goal_tools.who_helped import report
+from goal_tools import attribution
+from goal_tools import caching
 from goal_tools import foundation
 from goal_tools import gerrit
 from goal_tools import governance
@@ -25,9 +28,8 @@ from goal_tools import organizations
 
 LOG = logging.getLogger(__name__)
 
-
 SQL_CREATE = """
-create table contribution (
+create table if not exists contribution (
   review text,
   url text,
   branch text,
@@ -41,6 +43,26 @@ create table contribution (
 );
 """
 
+SQL_CREATE_SYNC = """
+create table if not exists sync (
+  query text primary key,
+  updated text
+);
+create index if not exists contribution_review on contribution (review);
+"""
+
+SQL_DELETE_REVIEW = """
+delete from contribution where review = ?
+"""
+
+SQL_SELECT_WATERMARK = """
+select updated from sync where query = ?
+"""
+
+SQL_UPDATE_WATERMARK = """
+insert or replace into sync (query, updated) values (?, ?)
+"""
+
 SQL_INSERT = """
 insert into contribution (
   review, url, branch, project, team, role, name, email,
@@ -52,6 +74,82 @@ values (
 )
 """
 
+_SQL_COLUMNS = (
+    'review', 'url', 'branch', 'project', 'team', 'role', 'name', 'email',
+    'date', 'organization',
+)
+
+SQL_CREATE_FILTER = """
+create temp table filter_{column} (value text primary key)
+"""
+
+
+def create_filtered_view(db, tests, transforms):
+    """Apply the report filters to an existing contribution table.
+
+    A temporary view named contribution is created over the table. It
+    hides the table for queries that do not give a schema name, so
+    they see only the rows passing the tests, with the values changed
+    by the transforms. Each test is applied once to each distinct
+    value in its column, and the values that pass are stored in a
+    temporary table for the view to check against. NULL values, such
+    as the team of unofficial repositories, are tested and transformed
+    as "*unknown", the value used in the contribution files.
+
+    :param db: The database.
+    :type db: sqlite3.Connection
+    :param tests: Functions taking a value from the column and
+        returning whether to keep the row, by column name.
+    :type tests: dict
+    :param transforms: Functions taking a value from the column and
+        returning the value to report, by column name.
+    :type transforms: dict
+
+    """
+    if not tests and not transforms:
+        return
+    conditions = []
+    for name, test in sorted(tests.items()):
+        column = name.lower()
+        db.execute(SQL_CREATE_FILTER.format(column=column))
+        values = db.execute(
+            'select distinct coalesce({column}, ?) '
+            'from main.contribution'.format(column=column),
+            (attribution.UNKNOWN,),
+        ).fetchall()
+        db.executemany(
+            'insert into filter_{column} (value) values (?)'.format(
+                column=column),
+            ((value,) for value, in values if test(value)),
+        )
+        conditions.append(
+            "coalesce({column}, '{unknown}') in "
+            "(select value from temp.filter_{column})".format(
+                column=column, unknown=attribution.UNKNOWN))
+    transforms = {
+        name.lower(): transform
+        for name, transform in transforms.items()
+    }
+    selected = []
+    for column in _SQL_COLUMNS:
+        transform = transforms.get(column)
+        if transform is None:
+            selected.append(column)
+            continue
+        function = 'report_{}'.format(column)
+        db.create_function(function, 1, transform)
+        selected.append(
+            "{function}(coalesce({column}, '{unknown}')) as {column}".format(
+                function=function, column=column,
+                unknown=attribution.UNKNOWN))
+    db.execute(
+        'create temp view contribution as select {} '
+        'from main.contribution{}'.format(
+            ', '.join(selected),
+            ' where ' + ' and '.join(conditions) if conditions else '',
+        )
+    )
+
 
 class QueryContributions(report.ContributionsReportBase):
     "Run an SQL query against the dataset."
@@ -84,7 +182,15 @@ class QueryContributions(report.ContributionsReportBase):
             data = list(data)
             print('DATA[0]:', data[0])
             cursor.executemany(SQL_INSERT, data)
+            db.commit()
         else:
+            # Apply the filter options in the database instead of
+            # loading the contribution files.
+            create_filtered_view(
+                db,
+                self.get_value_tests(parsed_args),
+                self.get_value_transforms(parsed_args),
+            )
             cursor = db.cursor()
 
         LOG.debug('querying')
@@ -121,6 +227,34 @@ class DBCreate(command.Command):
             action='store_true',
             help='force recreating the database',
         )
+        parser.add_argument(
+            '--incremental',
+            default=False,
+            action='store_true',
+            help=('update an existing database with the changes modified '
+                  'since the last run of the same query'),
+        )
+        parser.add_argument(
+            '--page-size',
+            default=200,
+            type=int,
+            help=('number of changes to request from gerrit at once '
+                  '(defaults to %(default)s)'),
+        )
+        parser.add_argument(
+            '--lookahead',
+            default=2,
+            type=int,
+            help=('number of result pages to request while processing '
+                  'the current one (defaults to %(default)s)'),
+        )
+        parser.add_argument(
+            '--stream',
+            default=False,
+            action='store_true',
+            help=('decode gerrit results as they arrive to save memory '
+                  '(ignores --lookahead)'),
+        )
         parser.add_argument(
             'query_string',
             help='gerrit query string',
@@ -135,13 +269,21 @@ class DBCreate(command.Command):
         team_data = governance.Governance(
             url=parsed_args.governance_project_list)
 
-        cache = self.app._load_cache_file(preload=False)
-        factory = gerrit.ReviewFactory(cache)
-        member_factory = foundation.MemberFactory(cache)
+        cache = self.app.cache
+        factory = gerrit.ReviewFactory(
+            cache, slim=self.app.options.slim_cache)
+        member_factory = foundation.MemberFactory(
+            cache, miss_ttl=self.app.member_miss_ttl)
         canonical_orgs = organizations.Organizations()
 
+        # When updating an existing database, rows for reviews we see
+        # again replace the old ones.
+        replace_rows = False
         if os.path.exists(parsed_args.db_file):
-            if not parsed_args.force:
+            if parsed_args.incremental:
+                replace_rows = True
+                LOG.debug('updating %s', parsed_args.db_file)
+            elif not parsed_args.force:
                 print('ERROR: {} already exists. '
                       'Use the --force flag to overwrite.'.format(
                           parsed_args.db_file))
@@ -151,11 +293,42 @@ class DBCreate(command.Command):
 
         db = sqlite3.connect(parsed_args.db_file)
         db.execute(SQL_CREATE)
+        db.executescript(SQL_CREATE_SYNC)
+
+        query_string = parsed_args.query_string
+        watermark = None
+        if parsed_args.incremental:
+            row = db.execute(
+                SQL_SELECT_WATERMARK, (parsed_args.query_string,),
+            ).fetchone()
+            if row:
+                watermark = datetime.datetime.strptime(
+                    row[0], gerrit.TIME_FORMAT)
+                LOG.info('fetching changes updated after %s', watermark)
+                query_string = gerrit.add_after(query_string, watermark)
+
+        # The newest update time seen, to use as the starting point
+        # for the next incremental run.
+        high_water = watermark
 
         def get_data():
-            review_source = factory.query(parsed_args.query_string)
+            nonlocal high_water
+            review_source = factory.query(
+                query_string,
+                page_size=parsed_args.page_size,
+                lookahead=parsed_args.lookahead,
+                stream=parsed_args.stream,
+            )
             for review in review_source:
 
+                updated = review.updated
+                if updated and (high_water is None or
+                                updated > high_water):
+                    high_water = updated
+
+                if replace_rows:
+                    db.execute(SQL_DELETE_REVIEW, (review.id,))
+
                 team_name = team_data.get_repo_owner(review.project)
 
                 if not parsed_args.include_unofficial and not team_name:
@@ -174,32 +347,31 @@ class DBCreate(command.Command):
                     participants = review.participants
 
                 for participant in participants:
-                    # Figure out which organization the user was
-                    # affiliated with at the time of the work.
-                    organization = None
-                    member = member_factory.fetch(participant.email)
-                    if member:
-                        affiliation = member.find_affiliation(participant.date)
-                        if affiliation and affiliation.organization:
-                            organization = canonical_orgs[
-                                affiliation.organization]
-                    else:
-                        organization = canonical_orgs.from_email(
-                            participant.email)
-                    if not organization:
-                        organization = "*unknown"
-
-                    yield (review.id, review.url, review.branch,
-                           review.project, team_name, participant.role,
-                           participant.name, participant.email,
-                           participant.date, organization)
+                    yield (review, participant)
 
         cursor = db.cursor()
-        data = get_data()
-        while True:
-            chunk = list(itertools.islice(data, 100))
-            if not chunk:
-                break
+        chunks = attribution.attribute(
+            get_data(), member_factory, canonical_orgs)
+        for chunk in chunks:
             LOG.debug('inserting %d', len(chunk))
-            cursor.executemany(SQL_INSERT, chunk)
+            cursor.executemany(
+                SQL_INSERT,
+                ((review.id, review.url, review.branch, review.project,
+                  team_data.get_repo_owner(review.project),
+                  participant.role, participant.name, participant.email,
+                  participant.date, organization)
+                 for review, participant, organization in chunk),
+            )
+            db.commit()
+
+        for obj in (team_data, member_factory, canonical_orgs):
+            LOG.debug('%s lookups: %s', type(obj).__name__,
+                      caching.memo_stats(obj))
+
+        if high_water is not None:
+            db.execute(
+                SQL_UPDATE_WATERMARK,
+                (parsed_args.query_string,
+                 high_water.strftime(gerrit.TIME_FORMAT)),
+            )
             db.commit()
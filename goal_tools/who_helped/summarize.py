@@ -10,28 +10,33 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-import collections
 import itertools
 import logging
 
+from goal_tools import columnar
+from goal_tools import groupby
+from goal_tools import hyperloglog
 from goal_tools.who_helped import contributions
 from goal_tools.who_helped import report
 
 LOG = logging.getLogger(__name__)
 
 
+def _count_columns(num_by, columns):
+    by_columns = columns[:num_by]
+    counts = groupby.count(
+        [codes for values, codes in by_columns],
+        [codes for values, codes in columns[num_by:]],
+    )
+    return groupby.decode(counts, [values for values, codes in by_columns])
+
+
 def _count_distinct(by_names, to_count, data_source):
-    counts = collections.defaultdict(set)
-    for row in data_source:
-        # Build the grouping key for this row. We always have at least
-        # one column name in by_names.
-        by_key = tuple(row[by] for by in by_names)
-        # Build a unique value based on what we were told to count,
-        # using the to_count names for columns if we have any or
-        # taking all of the column names to count the row itself.
-        count_key = tuple(row[c] for c in (to_count or row.keys()))
-        counts[by_key].add(count_key)
-    return {k: len(v) for k, v in counts.items()}
+    # Count each contribution unless we were told which combination
+    # of values to count.
+    to_count = [c for c in to_count if c != 'contributions']
+    columns = groupby.encode(data_source, list(by_names) + to_count)
+    return _count_columns(len(by_names), columns)
 
 
 class Anonymizer:
@@ -69,6 +74,94 @@ def anonymize(group_by, data):
         yield new_row
 
 
+class Summary:
+    """Accumulate the counts for one summary, a row at a time.
+
+    :param parsed_args: The options of the summarize command.
+    :type parsed_args: argparse.Namespace
+
+    """
+
+    def __init__(self, parsed_args):
+        self.group_by = parsed_args.by[:] or ['Organization']
+        self.to_count = parsed_args.count[:]
+        self.anonymize = parsed_args.anonymize
+        self._num_by = len(self.group_by)
+        count_names = [c for c in self.to_count if c != 'contributions']
+        self._names = self.group_by + count_names
+        self._encoder = None
+        self._sketches = None
+        # Counting the rows takes no more memory than counting
+        # exactly, so only estimate distinct values.
+        if parsed_args.approximate and count_names:
+            self._count_names = count_names
+            self._error_rate = parsed_args.error_rate
+            self._sketches = {}
+        else:
+            self._encoder = groupby.Encoder(self._names)
+
+    def add(self, row):
+        if self._sketches is None:
+            self._encoder.add(row)
+            return
+        key = tuple(row[name] for name in self.group_by)
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = hyperloglog.HyperLogLog(
+                self._error_rate)
+        sketch.add(hyperloglog.SEPARATOR.join(
+            row[name] for name in self._count_names))
+
+    def add_table(self, table, where=None):
+        """Add the rows of a columnar file that pass the tests.
+
+        When counting exactly, the codes stored in the file are used
+        instead of building a dict for each row.
+
+        :param table: The open columnar file.
+        :type table: goal_tools.columnar.Table
+        :param where: Functions taking a value from the column and
+            returning whether to keep the row, by column name.
+        :type where: dict
+
+        """
+        if self._sketches is not None:
+            for row in table.rows(where):
+                self.add(row)
+            return
+        selected = table.select(where) if where else None
+        columns = {}
+        for name in self._names:
+            codes = table.codes(name)
+            if selected is not None:
+                codes = map(codes.__getitem__, selected)
+            columns[name] = (table.values(name), codes)
+        self._encoder.extend(columns)
+
+    def _get_counts(self):
+        if self._sketches is None:
+            return _count_columns(self._num_by, self._encoder.columns())
+        return {key: len(sketch) for key, sketch in self._sketches.items()}
+
+    def get_results(self):
+        "Return the column names and rows for the report."
+        counts = self._get_counts()
+
+        output_rows = reversed(sorted(
+            (by_key + (count_value,)
+             for by_key, count_value in counts.items()),
+            key=lambda x: (x[-1], x[:-1]),  # by count first
+        ))
+
+        if self.anonymize:
+            output_rows = anonymize(self.group_by, output_rows)
+
+        to_count_column = ', '.join(self.to_count) or 'Contributions'
+        columns = tuple(self.group_by) + (to_count_column,)
+
+        return (columns, output_rows)
+
+
 class SummarizeContributions(report.ContributionsReportBase):
     "Summarize a contribution report."
 
@@ -97,29 +190,26 @@ class SummarizeContributions(report.ContributionsReportBase):
             action='store_true',
             help='mask organization and personal identifying information',
         )
+        report.add_approximate_arguments(parser)
         return parser
 
     def take_action(self, parsed_args):
-        group_by = parsed_args.by[:]
-        if not group_by:
-            group_by.append('Organization')
-
-        to_count = parsed_args.count[:]
-        to_count_column = ', '.join(to_count) or 'Contributions'
-
-        data = self.get_contributions(parsed_args)
-
-        counts = _count_distinct(group_by, to_count, data)
-
-        output_rows = reversed(sorted(
-            (by_key + (count_value,)
-             for by_key, count_value in counts.items()),
-            key=lambda x: (x[-1], x[:-1]),  # by count first
-        ))
-
-        if parsed_args.anonymize:
-            output_rows = anonymize(group_by, output_rows)
-
-        columns = tuple(group_by) + (to_count_column,)
-
-        return (columns, output_rows)
+        summary = Summary(parsed_args)
+        if self.get_value_transforms(parsed_args):
+            # The transforms change the values of each row.
+            for row in self.get_contributions(parsed_args):
+                summary.add(row)
+            return summary.get_results()
+        tests = self.get_value_tests(parsed_args)
+        for filename in parsed_args.contribution_list:
+            LOG.debug('reading %s', filename)
+            if not columnar.is_columnar(filename):
+                for row in columnar.read_rows(filename, tests):
+                    summary.add(row)
+                continue
+            table = columnar.Table(filename)
+            try:
+                summary.add_table(table, tests)
+            finally:
+                table.close()
+        return summary.get_results()
@@ -0,0 +1,89 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Load YAML data quickly.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import os.path
+import pkgutil
+import threading
+
+from goal_tools import caching
+
+LOG = logging.getLogger(__name__)
+
+# Packaged data files already loaded by this process, by name.
+_package_data = {}
+_package_data_lock = threading.Lock()
+
+
+def load(stream):
+    "Parse the YAML document in the string or file."
+    # PyYAML is imported here so commands that do not read YAML do not
+    # pay for it at startup.
+    import yaml
+    # Use the libyaml parser when PyYAML was built with it.
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(stream, Loader=loader)
+
+
+def _remove_stale(filename, pattern):
+    "Remove the files matching pattern other than filename."
+    for old in glob.glob(pattern):
+        if old == filename:
+            continue
+        LOG.debug('removing %s', old)
+        try:
+            os.remove(old)
+        except OSError as err:
+            LOG.debug('could not remove %s: %s', old, err)
+
+
+def load_package_data(name, cache_dir=caching.USER_CACHE):
+    """Return the parsed contents of a YAML file in the goal_tools package.
+
+    The parsed data is saved as a pickle named for a hash of the file
+    contents, so later runs only parse the file again after it
+    changes, and copies for older contents are removed. The result is
+    shared within the process, so callers must not modify it.
+
+    :param name: The name of the file in the package.
+    :type name: str
+    :param cache_dir: Directory for the parsed copy, or None. Defaults
+        to caching.user_cache_dir().
+    :type cache_dir: str
+
+    """
+    with _package_data_lock:
+        if name in _package_data:
+            return _package_data[name]
+        raw = pkgutil.get_data('goal_tools', name)
+        data = None
+        filename = None
+        cache_dir = caching.find_cache_dir(cache_dir)
+        if cache_dir:
+            prefix = os.path.join(cache_dir, os.path.splitext(name)[0])
+            filename = '{}-{}.pickle'.format(
+                prefix, hashlib.sha256(raw).hexdigest())
+            data = caching.read_pickle(filename)
+        if data is None:
+            LOG.debug('parsing %s', name)
+            data = load(raw.decode('utf-8'))
+            if filename:
+                caching.write_pickle(filename, data)
+                _remove_stale(filename, prefix + '-*.pickle')
+        _package_data[name] = data
+        return data
@@ -10,22 +10,27 @@ do
     txt_file=${input%.qry}.txt
     dat_file=${input%.qry}.dat
     rpt_file=${input%.qry}.rpt
+    col_file=${input%.qry}.col
 
-    # Text report
-    who-helped --debug contributions summarize $dat_file \
-        | tee $rpt_file
+    # Convert the contribution data once for the reports below
+    who-helped contributions convert $dat_file $col_file
 
-    # CSV version of report summarizing contributions per org
-    who-helped contributions summarize -f csv --ignore-single-vendor $dat_file \
-        | tee $rpt_file.contributions.csv
+    spec_file=${input%.qry}.rpt.yaml
 
-    # CSV version of report summarizing contributions per sponsor org
-    who-helped contributions summarize -f csv \
-               --highlight-sponsors --ignore-single-vendor $dat_file \
-        | tee $rpt_file.sponsor-contributions.csv
-
-    # CSV version of report summarizing people per org
-    who-helped contributions summarize -f csv \
-               --count Name --ignore-single-vendor $dat_file \
-        | tee $rpt_file.people.csv
+    # All of the reports, produced with one pass over the data
+    cat > $spec_file <<EOF
+# Text report
+- output: $rpt_file
+# CSV version of report summarizing contributions per org
+- output: $rpt_file.contributions.csv
+  args: -f csv --ignore-single-vendor
+# CSV version of report summarizing contributions per sponsor org
+- output: $rpt_file.sponsor-contributions.csv
+  args: -f csv --highlight-sponsors --ignore-single-vendor
+# CSV version of report summarizing people per org
+- output: $rpt_file.people.csv
+  args: -f csv --count Name --ignore-single-vendor
+EOF
+    who-helped --debug contributions batch $spec_file $col_file
+    cat $rpt_file
 done